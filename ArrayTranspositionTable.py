@@ -0,0 +1,231 @@
+from array import array
+from typing import Optional, Tuple
+
+import numpy as np
+
+from SearchState import SearchState
+from move import NO_MOVE
+
+# Types d'entrée, mêmes valeurs que dans les recherches utilisant TranspositionTable
+EXACT = 'exact'
+LOWERBOUND = 'lowerbound'
+UPPERBOUND = 'upperbound'
+FLAGS = (EXACT, LOWERBOUND, UPPERBOUND)
+FLAG_CODES = {flag: code for code, flag in enumerate(FLAGS)}
+
+# Politiques de remplacement
+DEPTH_PREFERRED = 'depth'
+ALWAYS_REPLACE = 'always'
+TWO_TIER = 'twoTier'
+POLICIES = (DEPTH_PREFERRED, ALWAYS_REPLACE, TWO_TIER)
+
+# Une clé nulle marque une case vide
+EMPTY_KEY = 0
+
+
+class ArrayTranspositionTable:
+    """
+        A fixed-capacity transposition table stored in parallel arrays.
+
+        Contrairement à TranspositionTable (dictionnaire qui grossit jusqu'à maxLen puis n'accepte plus rien), la
+        table a une taille fixe choisie à la création : l'index d'une entrée est donné par les bits de poids faible du
+        hash de Zobrist, et chaque champ est rangé dans un tableau `array` séparé. La mémoire utilisée est donc connue
+        à l'avance (environ 23 octets par entrée) et ne dépend pas de la durée de la partie.
+
+        Les entrées ne contiennent que des nombres : le meilleur coup est stocké sous sa forme encodée (voir move.py).
+
+        La table est faite pour être conservée d'un coup à l'autre de la partie : la profondeur stockée est la
+        profondeur restant à chercher sous la position (et non la distance à la racine) et chaque entrée porte la
+        génération de la recherche qui l'a écrite. Une position déjà cherchée lors du coup précédent est donc
+        directement réutilisable, et sweep permet de vider les entrées trop anciennes entre deux coups.
+
+        Args:
+            sizeLog2: log2 du nombre d'entrées. Default is 20 (environ 24 Mo).
+            policy: politique de remplacement quand deux positions tombent sur la même case :
+                - DEPTH_PREFERRED : on garde l'entrée la plus profonde, sauf si elle date d'une recherche précédente
+                - ALWAYS_REPLACE : la nouvelle entrée remplace toujours l'ancienne
+                - TWO_TIER : chaque case contient deux entrées, une gérée en DEPTH_PREFERRED et une en ALWAYS_REPLACE
+
+        Attributes:
+            size: nombre d'entrées de la table
+            age: génération actuelle, incrémentée à chaque nouvelle recherche (newSearch)
+            keys, scores, depths, flags, moves, ages: tableaux parallèles contenant les champs des entrées
+            nbOverwrites: nombre d'entrées écrasées par une autre position depuis le dernier resetCounters
+            lenTable: nombre d'entrées occupées
+            nbReused: nombre d'entrées lues qui proviennent d'une recherche précédente, depuis le dernier
+                resetCounters
+    """
+
+    def __init__(self, sizeLog2: int = 20, policy: str = DEPTH_PREFERRED):
+        if policy not in POLICIES:
+            raise ValueError(f"Politique de remplacement inconnue : {policy}")
+        self.policy = policy
+        self.size = 1 << sizeLog2
+        # En TWO_TIER, l'index désigne un groupe de 2 entrées consécutives
+        self.indexMask = (self.size >> 1) - 1 if policy == TWO_TIER else self.size - 1
+
+        self.allocate()
+        self.age = 0
+
+    def getLenTable(self) -> int:
+        return self.lenTable
+
+    def getNbOverwrites(self) -> int:
+        return self.nbOverwrites
+
+    def getMaxLen(self) -> int:
+        return self.size
+
+    def getNbReused(self) -> int:
+        return self.nbReused
+
+    def isFull(self) -> bool:
+        return self.lenTable >= self.size
+
+    def resetCounters(self) -> None:
+        """
+        Remet à zéro les compteurs d'une recherche (nbOverwrites, nbReused), à appeler au début de chaque recherche
+        """
+        self.nbOverwrites = 0
+        self.nbReused = 0
+
+    def newSearch(self) -> None:
+        """
+        Passe à la génération suivante : les entrées des recherches précédentes restent lisibles mais sont remplacées
+        en priorité
+        """
+        self.age = (self.age + 1) & 0xFF
+
+    def allocate(self) -> None:
+        """
+        Crée les tableaux (vides) contenant les entrées
+        """
+        self.keys = array('Q', bytes(8 * self.size))
+        self.scores = array('d', bytes(8 * self.size))
+        self.depths = array('b', bytes(self.size))
+        self.flags = array('B', bytes(self.size))
+        self.moves = array('i', bytes(4 * self.size))
+        self.ages = array('B', bytes(self.size))
+        self.lenTable = 0
+        self.resetCounters()
+
+    def clear(self) -> None:
+        self.allocate()
+
+    def sweep(self, maxAge: int = 2) -> int:
+        """
+        Vide les entrées écrites il y a plus de maxAge générations. À appeler entre deux coups, après newSearch : les
+        entrées du coup précédent (et de la réflexion de l'adversaire) sont conservées, les plus anciennes concernent
+        des positions qui ne peuvent plus être atteintes.
+
+        Args:
+            maxAge: nombre de générations précédentes à conserver
+
+        Returns:
+            int: nombre d'entrées supprimées
+        """
+        # Les tableaux supportent le protocole buffer : on les parcourt avec numpy sans copie
+        keys = np.frombuffer(self.keys, dtype=np.uint64)
+        ages = np.frombuffer(self.ages, dtype=np.uint8)
+        stale = (keys != EMPTY_KEY) & (((self.age - ages.astype(np.int16)) & 0xFF) > maxAge)
+        nbStale = int(np.count_nonzero(stale))
+        keys[stale] = EMPTY_KEY
+        self.lenTable -= nbStale
+        return nbStale
+
+    def probe(self, key: int) -> int:
+        """
+        Cherche l'entrée d'une position
+
+        Args:
+            key: hash de Zobrist de la position
+
+        Returns:
+            int: index de l'entrée dans les tableaux, -1 si la position n'est pas dans la table
+        """
+        if self.policy == TWO_TIER:
+            index = (key & self.indexMask) << 1
+            if self.keys[index] == key:
+                return index
+            if self.keys[index + 1] == key:
+                return index + 1
+            return -1
+        index = key & self.indexMask
+        return index if self.keys[index] == key else -1
+
+    def _replacementIndex(self, key: int, depth: int) -> int:
+        """
+        Choisit l'entrée où écrire une position selon la politique de remplacement
+
+        Returns:
+            int: index où écrire, -1 si l'entrée actuelle doit être conservée
+        """
+        if self.policy == ALWAYS_REPLACE:
+            return key & self.indexMask
+
+        index = key & self.indexMask
+        if self.policy == TWO_TIER:
+            index <<= 1
+        storedKey = self.keys[index]
+        if (storedKey == key or storedKey == EMPTY_KEY or self.ages[index] != self.age
+                or depth >= self.depths[index]):
+            return index
+        # L'entrée profonde est conservée, la position va dans l'entrée toujours remplacée
+        return index + 1 if self.policy == TWO_TIER else -1
+
+    def store(self, key: int, estimateScore: float, bestMove: int, flagCode: int, depth: int) -> None:
+        """
+        Écrit une entrée dans la table
+
+        Args:
+            key: hash de Zobrist de la position
+            estimateScore: évaluation de la position
+            bestMove: meilleur coup encodé (NO_MOVE si aucun)
+            flagCode: index du type d'entrée dans FLAGS
+            depth: profondeur restante de la recherche qui a produit l'évaluation
+        """
+        index = self._replacementIndex(key, depth)
+        if index < 0:
+            return
+        storedKey = self.keys[index]
+        if storedKey == EMPTY_KEY:
+            self.lenTable += 1
+        elif storedKey != key:
+            self.nbOverwrites += 1
+        self.keys[index] = key
+        self.scores[index] = estimateScore
+        self.depths[index] = depth
+        self.flags[index] = flagCode
+        self.moves[index] = bestMove
+        self.ages[index] = self.age
+
+    def addEntry(self, state: SearchState, estimateScore: float, bestMove: Optional[int], flag: str,
+                 shearchDepth: int, previousBestMove: Optional[int] = None) -> None:
+        """
+        Même interface que TranspositionTable.addEntry. previousBestMove n'est pas conservé.
+        """
+        self.store(state.getHash(), estimateScore, bestMove or NO_MOVE, FLAG_CODES[flag], shearchDepth)
+
+    def isInTable(self, state: SearchState) -> bool:
+        return self.probe(state.getHash()) >= 0
+
+    def getEntry(self, state: SearchState) -> Optional[Tuple[float, Optional[int], str, int, None]]:
+        """
+        Retrieves an entry from the table.
+
+        Args:
+            state: The search state to retrieve the entry for.
+
+        Returns:
+            (estimateScore, bestMove, flag, shearchDepth, previousBestMove) comme TranspositionTable.getEntry,
+            previousBestMove valant toujours None, ou None si la position n'est pas dans la table.
+        """
+        index = self.probe(state.getHash())
+        if index < 0:
+            return None
+        if self.ages[index] != self.age:
+            self.nbReused += 1
+        return (self.scores[index], self.moves[index] or None, FLAGS[self.flags[index]], self.depths[index], None)
+
+    def to_json(self) -> dict:
+        return {}
@@ -0,0 +1,79 @@
+from array import array
+from typing import Optional
+
+# Une clé nulle marque une case vide
+EMPTY_KEY = 0
+
+
+class EvaluationCache:
+    """
+        Cache des évaluations des feuilles, indexé par le hash de Zobrist de la position.
+
+        Une même feuille est souvent atteinte par plusieurs ordres de coups (transpositions) : plutôt que de relancer
+        l'heuristique (et son parcours des voisins de chaque bille), on réutilise la valeur déjà calculée. Le cache est
+        séparé de la table de transposition : il ne contient que des évaluations statiques, toujours exactes, et n'est
+        donc jamais en concurrence avec les entrées de la recherche.
+
+        Comme ArrayTranspositionTable, le cache a une taille fixe : l'index d'une entrée est donné par les bits de poids
+        faible du hash et une nouvelle évaluation remplace toujours l'ancienne. Le hash contient le joueur qui doit
+        jouer, et le nombre de billes perdues se déduit des billes sur le plateau : la valeur d'une entrée ne dépend
+        que du hash. Le cache ne doit servir qu'à une seule heuristique, mais peut être conservé d'un coup à l'autre.
+
+        Args:
+            sizeLog2: log2 du nombre d'entrées. Default is 16 (environ 1 Mo).
+
+        Attributes:
+            size: nombre d'entrées du cache
+            keys, values: tableaux parallèles contenant les entrées
+            nbHits: nombre d'évaluations trouvées dans le cache
+            nbMisses: nombre d'évaluations absentes du cache
+    """
+
+    def __init__(self, sizeLog2: int = 16):
+        self.size = 1 << sizeLog2
+        self.indexMask = self.size - 1
+        self.clear()
+
+    def clear(self) -> None:
+        self.keys = array('Q', bytes(8 * self.size))
+        self.values = array('d', bytes(8 * self.size))
+        self.resetCounters()
+
+    def resetCounters(self) -> None:
+        self.nbHits = 0
+        self.nbMisses = 0
+
+    def getNbHits(self) -> int:
+        return self.nbHits
+
+    def getNbMisses(self) -> int:
+        return self.nbMisses
+
+    def get(self, key: int) -> Optional[float]:
+        """
+        Cherche l'évaluation d'une position
+
+        Args:
+            key: hash de Zobrist de la position
+
+        Returns:
+            Optional[float]: évaluation stockée, None si la position n'est pas dans le cache
+        """
+        index = key & self.indexMask
+        if self.keys[index] == key:
+            self.nbHits += 1
+            return self.values[index]
+        self.nbMisses += 1
+        return None
+
+    def store(self, key: int, value: float) -> None:
+        """
+        Écrit l'évaluation d'une position, en remplaçant l'entrée présente à son index
+
+        Args:
+            key: hash de Zobrist de la position
+            value: évaluation de la position
+        """
+        index = key & self.indexMask
+        self.keys[index] = key
+        self.values[index] = value
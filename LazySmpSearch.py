@@ -0,0 +1,143 @@
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Tuple, Union
+
+from ArrayTranspositionTable import DEPTH_PREFERRED
+from SearchEngine import SearchEngine
+from SearchState import SearchState
+from SharedTranspositionTable import SharedTranspositionTable
+from game_state_abalone import GameStateAbalone
+
+# Moteur de recherche du processus, créé une seule fois par _initHelper
+_helperEngine: Optional[SearchEngine] = None
+
+
+def _initHelper(engineFactory: Callable[..., SearchEngine], table: SharedTranspositionTable, stopFlag) -> None:
+    global _helperEngine
+    # La table partagée est donnée à la construction : le moteur n'alloue pas de table à lui
+    _helperEngine = engineFactory(transpoTable=table)
+    _helperEngine.control.stopFlag = stopFlag
+
+
+def _perturbHelper(engine: SearchEngine, state: SearchState, helperId: int) -> None:
+    """
+    Bruit ajouté à l'historique d'un processus auxiliaire pour qu'il étudie les coups calmes dans un ordre différent.
+    À appeler après startSearch : MoveOrdering.newSearch divise l'historique par 2, bruit compris.
+    """
+    if engine.moveOrdering is not None:
+        engine.moveOrdering.randomizeHistory(random.Random(state.getHash() ^ helperId))
+
+
+def _helperSearch(encodedState: Tuple[int, ...], deadline: float, age: int, helperId: int) -> Tuple[int, int]:
+    """
+    Tâche exécutée par un processus : recherche complète de la racine, dont le seul résultat utile est ce qu'elle écrit
+    dans la table partagée
+
+    Args:
+        encodedState: racine encodée par SearchState.encode
+        deadline: instant (time.time()) auquel la recherche doit s'arrêter
+        age: génération actuelle de la table partagée
+        helperId: numéro du processus, détermine les perturbations de sa recherche
+
+    Returns:
+        (nombre d'états évalués, profondeur de la dernière itération terminée)
+    """
+    engine = _helperEngine
+    engine.transpoTable.age = age
+    state = SearchState.decode(encodedState, engine.positionScore)
+    # Perturbations : un processus sur deux commence une profondeur plus loin, et chacun étudie les coups calmes dans
+    # un ordre différent
+    startDepth = 1 + helperId % 2
+    state = engine.startSearch(state, deadline - time.time())
+    _perturbHelper(engine, state, helperId)
+    _, _, metrics = engine.iterativeDeepening(state, startDepth)
+    return metrics["Number of states evaluated"], metrics["Max depth finished"]
+
+
+class LazySmpSearch:
+    """
+        Recherche parallèle "Lazy SMP" : plusieurs processus cherchent la même racine en partageant leur table de
+        transposition.
+
+        Le moteur principal et nbWorkers processus auxiliaires lancent chacun l'approfondissement itératif complet
+        depuis la racine. Aucun travail n'est réparti explicitement : les auxiliaires, légèrement perturbés (profondeur
+        de départ, ordre des coups calmes), remplissent la table partagée (SharedTranspositionTable) avec des positions
+        que le moteur principal trouvera ensuite déjà cherchées. Seul le résultat du moteur principal est utilisé ; les
+        auxiliaires sont arrêtés dès qu'il a terminé.
+
+        La table partagée remplace la table du moteur principal : c'est sur elle que newSearch et sweep doivent être
+        appelés entre deux coups. Si le moteur principal a déjà une SharedTranspositionTable, elle est utilisée telle
+        quelle (sizeLog2 et policy sont alors ignorés) : le moteur peut ainsi être construit sans table à remplacer.
+
+        Args:
+            engine: moteur principal
+            engineFactory: fonction (définie au niveau d'un module, pour pouvoir être transmise aux processus)
+                construisant le moteur de chaque processus auxiliaire, appelée avec la table partagée en argument
+                transpoTable
+            nbWorkers: nombre de processus auxiliaires. Default is le nombre de coeurs moins un.
+            sizeLog2: log2 du nombre d'entrées de la table partagée
+            policy: politique de remplacement de la table partagée
+
+        Attributes:
+            table: table de transposition partagée
+            stopFlag: valeur partagée arrêtant les processus auxiliaires
+            executor: processus auxiliaires, créés une seule fois
+            metrics: compteurs de la dernière recherche
+    """
+
+    def __init__(self, engine: SearchEngine, engineFactory: Callable[..., SearchEngine], nbWorkers: Optional[int] = None,
+                 sizeLog2: int = 20, policy: str = DEPTH_PREFERRED):
+        self.engine = engine
+        self.nbWorkers = nbWorkers or max(1, os.cpu_count() - 1)
+        if isinstance(engine.transpoTable, SharedTranspositionTable):
+            self.table = engine.transpoTable
+        else:
+            self.table = SharedTranspositionTable(sizeLog2, policy)
+            self.engine.transpoTable = self.table
+        self.stopFlag = multiprocessing.RawValue('b', 0)
+        self.executor = ProcessPoolExecutor(self.nbWorkers, initializer=_initHelper,
+                                            initargs=(engineFactory, self.table, self.stopFlag))
+        self.metrics = {}
+
+    def close(self) -> None:
+        self.stopFlag.value = 1
+        self.executor.shutdown(cancel_futures=True)
+        self.table.close()
+
+    def search(self, state: Union[GameStateAbalone, SearchState], maxTime: float) -> Tuple[float, Optional[int], dict]:
+        """
+        Recherche du moteur principal, pendant que les processus auxiliaires cherchent la même racine
+
+        Args:
+            state: état de la partie (ou état de recherche)
+            maxTime: temps alloué à la recherche (s)
+
+        Returns:
+            Tuple containing the best evaluation, the best move (encoded, see move.py), and metrics.
+        """
+        if not isinstance(state, SearchState):
+            state = SearchState.fromGameState(state, positionScore=self.engine.positionScore)
+        self.stopFlag.value = 0
+        deadline = time.time() + maxTime
+        futures = [self.executor.submit(_helperSearch, state.encode(), deadline, self.table.age, helperId)
+                   for helperId in range(self.nbWorkers)]
+
+        bestEval, bestMove, metrics = self.engine.search(state, maxTime)
+
+        # Le résultat des auxiliaires n'est pas utilisé : on les arrête
+        self.stopFlag.value = 1
+        helperStates = 0
+        helperDepths = []
+        for future in futures:
+            nbStates, depth = future.result()
+            helperStates += nbStates
+            helperDepths.append(depth)
+
+        self.metrics = metrics
+        self.metrics["Number of workers"] = self.nbWorkers
+        self.metrics["Helper states evaluated"] = helperStates
+        self.metrics["Helper depths finished"] = helperDepths
+        return bestEval, bestMove, self.metrics
@@ -0,0 +1,145 @@
+import random
+from typing import List, Optional
+
+import move as mv
+import utils
+
+# Tranches de score : chaque catégorie de coups passe avant la suivante quel que soit l'historique
+CAPTURE_SCORE = 4 << 24
+KILLER_SCORE = 3 << 24
+EDGE_PUSH_SCORE = 2 << 24
+SUICIDE_SCORE = -(1 << 24)
+# Au-delà, tout l'historique est divisé par 2 pour rester sous EDGE_PUSH_SCORE et favoriser les coupures récentes
+MAX_HISTORY = 1 << 20
+
+
+class MoveOrdering:
+    """
+        Ordonnancement des coups par coups "killer" et table d'historique.
+
+        getMoveOrderScore ne distingue que les captures, les suicides et le reste : la cinquantaine de coups calmes
+        est étudiée dans l'ordre du générateur. On les classe ici avec deux informations mises à jour par la
+        recherche à chaque coupure beta :
+            - killers : pour chaque distance à la racine, les derniers coups calmes ayant provoqué une coupure. Un coup
+              qui réfute une position réfute souvent ses voisines au même niveau de l'arbre.
+            - historique : pour chaque couleur et chaque clé de coup (origine, direction, voir move.getMoveKey), la
+              somme des depth² des coupures provoquées par ce coup, quel que soit l'endroit de l'arbre.
+
+        Ordre obtenu : coup de la table de transposition, captures, killers, poussées d'une bille adverse sur le bord
+        (menace d'éjection), coups calmes par historique, suicides. C'est aussi l'ordre des étapes de MovePicker, qui
+        donne les killers avant de générer les autres coups.
+
+        Args:
+            maxPly: distance maximale à la racine pour laquelle des killers sont conservés
+            nbKillers: nombre de killers par niveau
+
+        Attributes:
+            killers: killers[ply] liste des derniers coups ayant provoqué une coupure à ce niveau
+            history: history[side][moveKey] score d'historique
+    """
+
+    def __init__(self, maxPly: int = 64, nbKillers: int = 2):
+        self.maxPly = maxPly
+        self.nbKillers = nbKillers
+        self.killers = [[] for _ in range(maxPly)]
+        self.history = [[0] * mv.NB_MOVE_KEYS for _ in range(2)]
+
+    def newSearch(self) -> None:
+        """
+        À appeler avant chaque recherche : les killers concernent l'ancienne racine et sont oubliés, l'historique est
+        conservé mais son poids est divisé par 2
+        """
+        self.killers = [[] for _ in range(self.maxPly)]
+        self.ageHistory()
+
+    def ageHistory(self) -> None:
+        for table in self.history:
+            for key in range(len(table)):
+                table[key] >>= 1
+
+    def randomizeHistory(self, rng: random.Random, amplitude: int = 64) -> None:
+        """
+        Ajoute un bruit aléatoire à l'historique, pour que plusieurs recherches de la même position (voir LazySmpSearch)
+        n'étudient pas les coups calmes dans le même ordre
+
+        Args:
+            rng: générateur aléatoire
+            amplitude: valeur maximale ajoutée à chaque score
+        """
+        for table in self.history:
+            for key in range(len(table)):
+                table[key] += rng.randrange(amplitude)
+
+    def getKillers(self, ply: int) -> List[int]:
+        return self.killers[ply] if ply < self.maxPly else []
+
+    def scoreMove(self, move: int, side: int, killers: List[int]) -> int:
+        """
+        Score d'ordonnancement d'un coup, les coups de score élevé sont étudiés en premier
+
+        Args:
+            move: coup encodé
+            side: couleur du joueur qui joue le coup
+            killers: killers du niveau du coup
+
+        Returns:
+            int: score du coup
+        """
+        orderScore = utils.getMoveOrderScore(move)
+        if orderScore > 0:
+            return CAPTURE_SCORE
+        if orderScore < 0:
+            return SUICIDE_SCORE
+        if move in killers:
+            # Le killer le plus récent en premier
+            return KILLER_SCORE + len(killers) - killers.index(move)
+        if mv.isEdgePush(move):
+            return EDGE_PUSH_SCORE
+        return self.history[side][mv.getMoveKey(move)]
+
+    def orderMoves(self, moves: List[int], ttMove: Optional[int], ply: int, side: int) -> List[int]:
+        """
+        Ordonne les coups d'un noeud
+
+        Args:
+            moves: coups possibles
+            ttMove: meilleur coup trouvé dans la table de transposition (None si aucun)
+            ply: distance du noeud à la racine
+            side: couleur du joueur qui doit jouer
+
+        Returns:
+            List[int]: coups dans l'ordre où les étudier
+        """
+        killers = self.getKillers(ply)
+        moves.sort(key=lambda move: self.scoreMove(move, side, killers), reverse=True)
+        if ttMove in moves:
+            moves.remove(ttMove)
+            moves.insert(0, ttMove)
+        return moves
+
+    def onCutoff(self, move: int, ply: int, side: int, depth: int) -> None:
+        """
+        Met à jour les killers et l'historique après une coupure beta
+
+        Args:
+            move: coup ayant provoqué la coupure
+            ply: distance du noeud à la racine
+            side: couleur du joueur qui a joué le coup
+            depth: profondeur restant à chercher sous le noeud
+        """
+        # Les coups tactiques sont déjà étudiés en premier, seuls les coups calmes sont retenus
+        if utils.getMoveOrderScore(move) != 0 or mv.isEdgePush(move):
+            return
+
+        if ply < self.maxPly:
+            killers = self.killers[ply]
+            if move in killers:
+                killers.remove(move)
+            killers.insert(0, move)
+            del killers[self.nbKillers:]
+
+        table = self.history[side]
+        key = mv.getMoveKey(move)
+        table[key] += depth * depth
+        if table[key] > MAX_HISTORY:
+            self.ageHistory()
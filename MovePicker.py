@@ -0,0 +1,70 @@
+from typing import Iterator, Optional
+
+from MoveOrdering import MoveOrdering
+from SearchState import SearchState
+
+import move as mv
+
+
+class MovePicker:
+    """
+        Fournit les coups d'un noeud par étapes, en ne générant chaque catégorie que lorsqu'elle est demandée.
+
+        Plutôt que de générer et trier tous les coups avant d'étudier le premier, les coups sont produits dans l'ordre :
+            1. le coup de la table de transposition, s'il est jouable dans la position
+            2. les captures (SearchState.generateCaptures, qui ne parcourt que les billes adverses du bord)
+            3. les killers du niveau, s'ils sont jouables
+            4. les autres coups, générés puis triés par MoveOrdering.scoreMove seulement à ce moment
+
+        Quand une coupure beta a lieu sur l'un des premiers coups, les étapes suivantes ne sont jamais exécutées.
+
+        Args:
+            state: état de recherche du noeud
+            ttMove: meilleur coup de la table de transposition (None si aucun)
+            ply: distance du noeud à la racine
+            moveOrdering: killers et historique utilisés pour les étapes 3 et 4
+
+        Attributes:
+            stage: dernière étape atteinte (0 tant qu'aucun coup n'a été demandé)
+    """
+
+    TT_MOVE = 1
+    CAPTURES = 2
+    KILLERS = 3
+    QUIETS = 4
+
+    def __init__(self, state: SearchState, ttMove: Optional[int], ply: int, moveOrdering: MoveOrdering):
+        self.state = state
+        self.ttMove = ttMove
+        self.ply = ply
+        self.moveOrdering = moveOrdering
+        self.stage = 0
+
+    def __iter__(self) -> Iterator[int]:
+        state = self.state
+        done = set()
+
+        self.stage = self.TT_MOVE
+        ttMove = self.ttMove
+        if ttMove and state.isLegal(ttMove):
+            done.add(ttMove)
+            yield ttMove
+
+        self.stage = self.CAPTURES
+        for move in state.generateCaptures():
+            if move not in done:
+                done.add(move)
+                yield move
+
+        self.stage = self.KILLERS
+        for move in list(self.moveOrdering.getKillers(self.ply)):
+            if move not in done and state.isLegal(move):
+                done.add(move)
+                yield move
+
+        self.stage = self.QUIETS
+        side = state.getSide()
+        killers = self.moveOrdering.getKillers(self.ply)
+        quiets = [move for move in state.generateMoves() if move not in done and not mv.isCapture(move)]
+        quiets.sort(key=lambda move: self.moveOrdering.scoreMove(move, side, killers), reverse=True)
+        yield from quiets
@@ -0,0 +1,177 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple, Union
+
+from SearchEngine import SearchEngine, WIN_SCORE
+from SearchState import SearchState
+from game_state_abalone import GameStateAbalone
+
+infinity = math.inf
+
+# Moteur de recherche du processus, créé une seule fois par _initWorker et conservé (avec sa table de transposition)
+# d'une tâche à l'autre
+_workerEngine: Optional[SearchEngine] = None
+# Hash de la dernière racine cherchée par le processus
+_workerRoot: Optional[int] = None
+
+
+def _initWorker(engineFactory: Callable[[], SearchEngine]) -> None:
+    global _workerEngine
+    _workerEngine = engineFactory()
+
+
+def _searchRootMoves(encodedState: Tuple[int, ...], moves: List[int], depth: int, alpha: float,
+                     deadline: float) -> Tuple[List[Tuple[int, float, List[int]]], int, bool]:
+    """
+    Tâche exécutée par un processus : cherche des coups de la racine à une profondeur fixe
+
+    Args:
+        encodedState: racine encodée par SearchState.encode
+        moves: coups de la racine à chercher
+        depth: profondeur de l'itération
+        alpha: valeur déjà obtenue pour un autre coup de la racine, les coups qui ne la dépassent pas ne sont pas
+            cherchés exactement
+        deadline: instant (time.time()) auquel la recherche doit s'arrêter
+
+    Returns:
+        ([(coup, évaluation, suite de la variation principale après le coup)] des coups terminés, nombre d'états
+        évalués, True si la recherche a été interrompue)
+    """
+    global _workerRoot
+    engine = _workerEngine
+    state = SearchState.decode(encodedState, engine.positionScore)
+    # Comme entre deux coups de la partie, la table passe à la génération suivante et les killers sont oubliés quand la
+    # racine change, et seulement dans ce cas : les tâches suivantes de la même recherche les réutilisent
+    newRoot = state.getHash() != _workerRoot
+    if newRoot and engine.transpoTable is not None:
+        engine.transpoTable.newSearch()
+        engine.transpoTable.sweep()
+    _workerRoot = state.getHash()
+    engine.startSearch(state, deadline - time.time(), newRoot)
+
+    results = []
+    for move in moves:
+        evaluation = engine.searchMove(state, move, alpha, infinity, depth, 0, False)
+        if engine.stopRecherche:
+            break
+        # La suite de la variation n'est que dans la table de ce processus
+        token = state.makeMove(move)
+        results.append((move, evaluation, engine.getPrincipalVariation(state, depth - 1)))
+        state.unmakeMove(token)
+        alpha = max(alpha, evaluation)
+    return results, engine.metrics["Number of states evaluated"], engine.stopRecherche
+
+
+class ParallelSearch:
+    """
+        Recherche parallèle par partage des coups de la racine entre plusieurs processus.
+
+        À chaque itération de l'approfondissement itératif, le premier coup de la racine (le meilleur de l'itération
+        précédente) est cherché seul par le moteur principal, comme dans "Young Brothers Wait" : sa valeur sert ensuite
+        de borne alpha à tous les autres coups, répartis entre les processus d'un ProcessPoolExecutor. Les coups qui ne
+        la dépassent pas sont réfutés par une recherche à fenêtre nulle.
+
+        Les processus reçoivent la racine encodée (SearchState.encode, 8 entiers) plutôt qu'un GameStateAbalone
+        sérialisé. Chacun possède son propre moteur, créé une seule fois par engineFactory, dont la table de
+        transposition est conservée d'une itération et d'un coup à l'autre.
+
+        Args:
+            engine: moteur principal, cherche le premier coup de chaque itération
+            engineFactory: fonction (définie au niveau d'un module, pour pouvoir être transmise aux processus)
+                construisant le moteur de chaque processus
+            nbWorkers: nombre de processus. Default is le nombre de coeurs.
+            chunkSize: nombre de coups de la racine par tâche
+
+        Attributes:
+            executor: processus de recherche, créés une seule fois
+            metrics: compteurs de la dernière recherche
+    """
+
+    def __init__(self, engine: SearchEngine, engineFactory: Callable[[], SearchEngine], nbWorkers: Optional[int] = None,
+                 chunkSize: int = 1):
+        self.engine = engine
+        self.nbWorkers = nbWorkers or os.cpu_count()
+        self.chunkSize = chunkSize
+        self.executor = ProcessPoolExecutor(self.nbWorkers, initializer=_initWorker, initargs=(engineFactory,))
+        self.metrics = {}
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+    def search(self, state: Union[GameStateAbalone, SearchState], maxTime: float) -> Tuple[float, Optional[int], dict]:
+        """
+        Approfondissement itératif jusqu'à engine.maxDepth ou jusqu'à la fin du temps alloué
+
+        Args:
+            state: état de la partie (ou état de recherche)
+            maxTime: temps alloué à la recherche (s)
+
+        Returns:
+            Tuple containing the best evaluation, the best move (encoded, see move.py), and metrics.
+        """
+        engine = self.engine
+        rootState = engine.startSearch(state, maxTime)
+        encodedState = rootState.encode()
+        deadline = engine.startTime + maxTime
+        nbWorkerStates = 0
+
+        bestEval = None
+        bestMove = None
+        # Suite de la variation principale quand le meilleur coup a été cherché par un processus
+        bestPv = None
+        maxDepthFinished = 0
+        for depth in range(1, engine.maxDepth + 1):
+            if bestMove is not None and engine.timeManager is not None \
+                    and not engine.timeManager.shouldStartIteration():
+                break
+            moves = engine.orderMoves(rootState.generateMoves(), bestMove, 0, rootState.getSide())
+            if not moves:
+                break
+
+            # Le premier coup est cherché seul, avec la fenêtre complète
+            iterationEval = engine.searchMove(rootState, moves[0], -infinity, infinity, depth, 0, True)
+            iterationMove = moves[0]
+            iterationPv = None
+            if engine.stopRecherche:
+                if bestMove is None:
+                    bestEval, bestMove = iterationEval, iterationMove
+                break
+
+            futures = [self.executor.submit(_searchRootMoves, encodedState, moves[i:i + self.chunkSize], depth,
+                                            iterationEval, deadline)
+                       for i in range(1, len(moves), self.chunkSize)]
+            complete = True
+            for future in futures:
+                results, nbStates, stopped = future.result()
+                nbWorkerStates += nbStates
+                complete = complete and not stopped
+                for move, evaluation, pv in results:
+                    if evaluation > iterationEval:
+                        iterationEval, iterationMove, iterationPv = evaluation, move, pv
+
+            if not complete:
+                # Un coup terminé qui dépasse le premier est meilleur que lui à cette profondeur, on le garde
+                if bestMove is None or iterationMove != moves[0]:
+                    bestEval, bestMove, bestPv = iterationEval, iterationMove, iterationPv
+                break
+            bestEval, bestMove, bestPv = iterationEval, iterationMove, iterationPv
+            maxDepthFinished = depth
+            if engine.timeManager is not None:
+                engine.timeManager.onIterationFinished(bestEval, bestMove)
+            # La racine est stockée pour que la variation principale parte du coup choisi
+            engine.storeEntry(rootState, bestEval, bestMove, 'exact', depth)
+            # Inutile d'aller plus loin si la fin de partie est certaine
+            if abs(bestEval) >= WIN_SCORE:
+                break
+
+        engine.finishSearch(rootState, maxDepthFinished)
+        self.metrics = engine.metrics
+        # La table du moteur principal ne contient que le coup de la racine : la suite (dont la réponse prévue de
+        # l'adversaire, utilisée par Ponderer) vient du processus qui a cherché ce coup
+        if bestPv is not None:
+            self.metrics["Principal variation"] = [bestMove] + bestPv
+        self.metrics["Number of states evaluated"] += nbWorkerStates
+        self.metrics["Number of workers"] = self.nbWorkers
+        return bestEval, bestMove, self.metrics
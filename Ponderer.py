@@ -0,0 +1,96 @@
+import threading
+from typing import List, Optional
+
+from SearchEngine import SearchEngine
+from SearchState import SearchState
+
+# Temps maximal d'une réflexion pendant le tour de l'adversaire (s), elle est normalement arrêtée bien avant
+MAX_PONDER_TIME = 600
+# Intervalle entre deux demandes d'arrêt, au cas où la recherche démarrerait juste après la première
+STOP_RETRY_INTERVAL = 0.01
+
+
+class Ponderer:
+    """
+        Réflexion pendant le tour de l'adversaire ("pondering").
+
+        Après avoir choisi son coup, le joueur prévoit la réponse de l'adversaire (second coup de la variation
+        principale) et cherche, dans un thread, la position qui en résulte. Cette recherche écrit dans la table de
+        transposition du joueur : au coup suivant, si l'adversaire a bien joué la réponse prévue ("ponder hit"), les
+        premières itérations de la recherche sont immédiates. Sinon, la table contient au moins des positions proches.
+
+        Le moteur de réflexion est distinct du moteur principal (ordonnancement et arrêt propres) mais partage sa table.
+        La réflexion doit être arrêtée (stop) avant que le moteur principal n'utilise la table.
+
+        Le thread partage le GIL : si les deux joueurs tournent dans le même processus (mode local de main_abalone), la
+        réflexion ralentit l'adversaire au lieu d'utiliser un temps libre.
+
+        Args:
+            engine: moteur utilisé pour la réflexion
+
+        Attributes:
+            thread: thread de la réflexion en cours (None si aucune)
+            ponderHash: hash de la position cherchée
+            result: (évaluation, coup, métriques) de la dernière réflexion terminée ou arrêtée
+    """
+
+    def __init__(self, engine: SearchEngine):
+        self.engine = engine
+        self.thread: Optional[threading.Thread] = None
+        self.ponderHash: Optional[int] = None
+        self.result = None
+
+    def isRunning(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    @staticmethod
+    def predictPosition(state: SearchState, principalVariation: List[int]) -> Optional[SearchState]:
+        """
+        Position attendue au prochain coup du joueur : son coup puis la réponse prévue de l'adversaire
+
+        Args:
+            state: état de recherche avant le coup du joueur
+            principalVariation: variation principale de la recherche, commençant par le coup du joueur
+
+        Returns:
+            Optional[SearchState]: nouvel état, None si la variation est trop courte ou la partie terminée
+        """
+        if len(principalVariation) < 2:
+            return None
+        ponderState = state.copy()
+        for move in principalVariation[:2]:
+            if ponderState.isDone() or not ponderState.isLegal(move):
+                return None
+            ponderState.makeMove(move)
+        return None if ponderState.isDone() else ponderState
+
+    def start(self, ponderState: SearchState) -> None:
+        """
+        Lance la réflexion sur une position dans un thread
+        """
+        self.stop()
+        self.ponderHash = ponderState.getHash()
+        self.result = None
+        self.thread = threading.Thread(target=self._run, args=(ponderState,), daemon=True)
+        self.thread.start()
+
+    def _run(self, ponderState: SearchState) -> None:
+        self.result = self.engine.search(ponderState, MAX_PONDER_TIME)
+
+    def stop(self) -> None:
+        """
+        Arrête la réflexion en cours et attend la fin du thread
+        """
+        while self.isRunning():
+            self.engine.control.stop()
+            self.thread.join(STOP_RETRY_INTERVAL)
+        self.thread = None
+
+    def isHit(self, state: SearchState) -> bool:
+        """
+        Indique si la position à jouer est celle sur laquelle la réflexion a porté
+        """
+        return self.ponderHash is not None and state.getHash() == self.ponderHash
+
+    def getDepthFinished(self) -> int:
+        return self.result[2]["Max depth finished"] if self.result is not None else 0
@@ -0,0 +1,115 @@
+import math
+import time
+from typing import Optional
+
+infinity = math.inf
+
+# Bornes du nombre de noeuds entre deux lectures de l'horloge
+MIN_CHECK_EVERY = 1
+MAX_CHECK_EVERY = 4096
+
+
+class SearchControl:
+    """
+        Décide quand une recherche doit s'arrêter : temps écoulé, nombre de noeuds atteint ou demande extérieure.
+
+        Lire l'horloge (time.time()) à chaque noeud coûte une part mesurable du temps par noeud en CPython. isOver,
+        appelé à chaque noeud, ne fait qu'incrémenter un compteur : l'horloge n'est lue que tous les checkEvery noeuds.
+        checkEvery s'ajuste à chaque lecture selon le nombre de noeuds par seconde observé, pour que deux lectures
+        soient espacées d'environ pollInterval secondes. La recherche dépasse donc son temps d'au plus pollInterval.
+
+        Avec nodeLimit, la recherche s'arrête exactement au même noeud d'une exécution à l'autre, indépendamment de la
+        vitesse de la machine : les interruptions sont reproductibles.
+
+        Args:
+            pollInterval: temps visé entre deux lectures de l'horloge (s)
+            nodeLimit: nombre maximal de noeuds par recherche (None pour ne pas limiter)
+            stopFlag: valeur partagée (multiprocessing.RawValue) qui arrête la recherche quand elle est non nulle, lue en
+                même temps que l'horloge
+
+        Attributes:
+            startTime: début de la recherche
+            deadline: instant auquel la recherche doit s'arrêter
+            nbNodes: nombre de noeuds depuis le début de la recherche
+            checkEvery: nombre actuel de noeuds entre deux lectures de l'horloge
+            nbChecks: nombre de lectures de l'horloge depuis le début de la recherche
+            stopped: True quand la recherche doit s'arrêter
+    """
+
+    def __init__(self, pollInterval: float = 0.005, nodeLimit: Optional[int] = None, stopFlag=None):
+        self.pollInterval = pollInterval
+        self.nodeLimit = nodeLimit
+        self.stopFlag = stopFlag
+        self.startTime = 0.
+        self.deadline = infinity
+        self.nbNodes = 0
+        self.nextCheck = 0
+        self.checkEvery = MIN_CHECK_EVERY
+        self.nbChecks = 0
+        self.lastCheckTime = 0.
+        self.lastCheckNodes = 0
+        self.stopped = False
+
+    def start(self, maxTime: float) -> None:
+        """
+        Démarre une recherche. checkEvery est conservé d'une recherche à l'autre : la vitesse varie peu.
+
+        Args:
+            maxTime: temps alloué à la recherche (s)
+        """
+        self.startTime = time.time()
+        self.deadline = self.startTime + maxTime
+        self.nbNodes = 0
+        self.nbChecks = 0
+        self.lastCheckTime = self.startTime
+        self.lastCheckNodes = 0
+        self.stopped = False
+        self.nextCheck = self._nextCheck()
+
+    def stop(self) -> None:
+        """
+        Demande l'arrêt de la recherche (par exemple depuis un autre thread), pris en compte au noeud suivant
+        """
+        self.stopped = True
+
+    def getElapsed(self) -> float:
+        return time.time() - self.startTime
+
+    def isOver(self) -> bool:
+        """
+        À appeler à chaque noeud
+
+        Returns:
+            bool: True si la recherche doit s'arrêter
+        """
+        self.nbNodes += 1
+        if self.nbNodes < self.nextCheck or self.stopped:
+            return self.stopped
+        return self._check()
+
+    def _nextCheck(self) -> int:
+        nextCheck = self.nbNodes + self.checkEvery
+        if self.nodeLimit is not None:
+            nextCheck = min(nextCheck, self.nodeLimit)
+        return nextCheck
+
+    def _check(self) -> bool:
+        self.nbChecks += 1
+        now = time.time()
+        if now >= self.deadline \
+                or (self.nodeLimit is not None and self.nbNodes >= self.nodeLimit) \
+                or (self.stopFlag is not None and self.stopFlag.value):
+            self.stopped = True
+            return True
+
+        # Nombre de noeuds qu'on peut chercher en pollInterval à la vitesse observée depuis la dernière lecture
+        elapsed = now - self.lastCheckTime
+        if elapsed > 0:
+            nodesPerSecond = (self.nbNodes - self.lastCheckNodes) / elapsed
+            self.checkEvery = int(min(max(nodesPerSecond * self.pollInterval, MIN_CHECK_EVERY), MAX_CHECK_EVERY))
+        else:
+            self.checkEvery = min(self.checkEvery * 2, MAX_CHECK_EVERY)
+        self.lastCheckTime = now
+        self.lastCheckNodes = self.nbNodes
+        self.nextCheck = self._nextCheck()
+        return False
@@ -0,0 +1,532 @@
+import math
+import time
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ArrayTranspositionTable import ArrayTranspositionTable
+from EvaluationCache import EvaluationCache
+from MoveOrdering import MoveOrdering
+from MovePicker import MovePicker
+from SearchControl import SearchControl
+from SearchState import SearchState, DRAW
+from TimeManager import TimeManager
+from bitboard import WHITE, BLACK
+from game_state_abalone import GameStateAbalone
+
+import heuristique
+import utils
+
+infinity = math.inf
+
+# Même valeur que algoRecherche.winScore
+WIN_SCORE = 99999
+# Les heuristiques renvoient des entiers : une fenêtre nulle est de largeur 1
+NULL_WINDOW = 1
+
+
+class SearchEngine:
+    """
+        Moteur de recherche configurable travaillant sur un SearchState (make/unmake).
+
+        Regroupe en une seule boucle ce que les différentes versions de algoRecherche réimplémentent chacune :
+            - approfondissement itératif, le meilleur coup de l'itération précédente étant étudié en premier
+            - principal variation search : le premier coup est cherché avec la fenêtre complète, les suivants avec une
+              fenêtre nulle, et ne sont recherchés avec la fenêtre complète que s'ils la dépassent
+            - fenêtres d'aspiration autour du score de l'itération précédente, élargies en cas d'échec
+
+        L'heuristique, l'ordonnancement des coups et la table de transposition sont des composants interchangeables.
+
+        Args:
+            heuristiqueFct: heuristique évaluant un SearchState du point de vue du joueur qui doit jouer
+            transpoTable: table de transposition (None pour s'en passer). Elle peut être conservée d'un coup à l'autre.
+            orderFct: score d'ordonnancement d'un coup encodé, les coups de score élevé sont étudiés en premier
+            moveOrdering: ordonnancement par killers et historique (voir MoveOrdering), remplace orderFct s'il est
+                donné. Les coups sont alors fournis par étapes par un MovePicker.
+            maxDepth: profondeur maximale de l'approfondissement itératif
+            aspirationWindow: demi-largeur de la fenêtre d'aspiration (0 pour la désactiver)
+            usePvs: utilise les recherches à fenêtre nulle (sinon alpha-beta classique)
+            quiescenceDepth: nombre de demi-coups de prolongation au-delà de la profondeur tant qu'une capture est
+                possible (comme alphabeta_search_quiescent), 0 pour ne pas prolonger
+            batchEvaluator: évaluation vectorisée de plusieurs positions (voir heuristiqueBatch), qui doit calculer la
+                même chose que heuristiqueFct. Si elle est donnée (et sans prolongation de quiescence), les fils des
+                noeuds à 1 demi-coup des feuilles sont évalués en un seul appel. Elle demande moveOrdering : avec
+                orderFct seul, le premier coup coupe trop rarement et le lot évalue des fils qui auraient été coupés.
+            positionScore: score de position de chaque case, donné au SearchState pour qu'il tienne à jour les termes
+                de l'évaluation (nécessaire pour heuristique.positionHeuristiqueV2Incremental)
+            evaluationCache: cache des évaluations des feuilles (None pour s'en passer). Il ne doit servir qu'à
+                heuristiqueFct et peut être conservé d'un coup à l'autre.
+            materialFct: terme matériel de heuristiqueFct (par exemple heuristique.materialHeuristiqueV2). S'il est
+                donné, l'évaluation est paresseuse : quand le matériel est hors de la fenêtre (alpha, beta) de plus de
+                lazyMargin, la borne obtenue est renvoyée sans calculer les termes de position.
+            lazyMargin: écart maximal entre heuristiqueFct et materialFct (par exemple heuristique.POSITIONAL_SWING_V2)
+            timeManager: gestion du temps entre les itérations (voir TimeManager). S'il est donné, startMove doit être
+                appelé avant chaque recherche, et le temps passé à search est la limite dure du coup.
+            control: arrêt de la recherche (temps, nombre de noeuds, demande extérieure), voir SearchControl. Default
+                is un SearchControl qui ne lit l'horloge que tous les quelques centaines de noeuds.
+
+        Attributes:
+            stopRecherche: True quand le temps alloué est écoulé
+            metrics: compteurs de la dernière recherche
+    """
+
+    def __init__(self,
+                 heuristiqueFct: Callable[[SearchState], float] = heuristique.positionHeuristiqueV2Bitboard,
+                 transpoTable: Optional[ArrayTranspositionTable] = None,
+                 orderFct: Callable[[int], float] = utils.getMoveOrderScore,
+                 moveOrdering: Optional[MoveOrdering] = None,
+                 maxDepth: int = 20,
+                 aspirationWindow: float = 50,
+                 usePvs: bool = True,
+                 quiescenceDepth: int = 0,
+                 batchEvaluator: Optional[Callable[[List[Sequence[int]], List[Sequence[int]], int], np.ndarray]] = None,
+                 positionScore: Optional[List[int]] = None,
+                 evaluationCache: Optional[EvaluationCache] = None,
+                 materialFct: Optional[Callable[[SearchState], float]] = None,
+                 lazyMargin: float = 0,
+                 timeManager: Optional[TimeManager] = None,
+                 control: Optional[SearchControl] = None):
+        if batchEvaluator is not None and moveOrdering is None:
+            raise ValueError("L'évaluation par lots (batchEvaluator) demande un ordonnancement (moveOrdering)")
+        self.heuristiqueFct = heuristiqueFct
+        self.transpoTable = transpoTable
+        self.orderFct = orderFct
+        self.moveOrdering = moveOrdering
+        self.maxDepth = maxDepth
+        self.aspirationWindow = aspirationWindow
+        self.usePvs = usePvs
+        self.quiescenceDepth = quiescenceDepth
+        self.batchEvaluator = batchEvaluator
+        self.positionScore = positionScore
+        self.evaluationCache = evaluationCache
+        self.materialFct = materialFct
+        self.lazyMargin = lazyMargin
+        self.timeManager = timeManager
+        self.control = control if control is not None else SearchControl()
+
+        self.startTime = 0.
+        self.maxTime = infinity
+        self.stopRecherche = False
+        self.metrics = {}
+
+    def isTimeOver(self) -> bool:
+        return self.control.isOver()
+
+    def orderMoves(self, moves: List[int], ttMove: Optional[int], ply: int, side: int) -> List[int]:
+        """
+        Ordonne les coups d'un noeud : le coup de la table de transposition en premier, puis selon moveOrdering ou
+        orderFct
+
+        Args:
+            moves: coups possibles
+            ttMove: meilleur coup trouvé dans la table de transposition (None si aucun)
+            ply: distance du noeud à la racine
+            side: couleur du joueur qui doit jouer
+
+        Returns:
+            List[int]: coups dans l'ordre où les étudier
+        """
+        if self.moveOrdering is not None:
+            return self.moveOrdering.orderMoves(moves, ttMove, ply, side)
+        moves.sort(key=self.orderFct, reverse=True)
+        if ttMove in moves:
+            moves.remove(ttMove)
+            moves.insert(0, ttMove)
+        return moves
+
+    def evaluate(self, state: SearchState, alpha: float, beta: float, ply: int) -> float:
+        """
+        Évaluation d'une feuille de la recherche, lue dans evaluationCache si la position y est déjà.
+
+        Avec materialFct, une borne suffit quand l'évaluation ne peut pas entrer dans la fenêtre : la recherche étant
+        fail-soft, une valeur <= alpha (ou >= beta) n'a besoin que d'être un majorant (ou un minorant) de
+        l'évaluation exacte. Ces bornes ne sont pas mises dans le cache.
+        """
+        cache = self.evaluationCache
+        if cache is not None:
+            evaluation = cache.get(state.getHash())
+            if evaluation is not None:
+                return evaluation
+
+        if self.materialFct is not None:
+            material = self.materialFct(state)
+            if material + self.lazyMargin <= alpha:
+                self.metrics["Lazy evaluations"] += 1
+                return material + self.lazyMargin
+            if material - self.lazyMargin >= beta:
+                self.metrics["Lazy evaluations"] += 1
+                return material - self.lazyMargin
+
+        evaluation = self.heuristiqueFct(state)
+        if cache is not None:
+            cache.store(state.getHash(), evaluation)
+        return evaluation
+
+    def negamax(self, state: SearchState, alpha: float, beta: float, depth: int, ply: int) -> Tuple[float, Optional[int]]:
+        """
+        Principal variation search (negamax fail-soft)
+
+        Args:
+            state: état de recherche, modifié puis restauré
+            alpha: borne inférieure de la fenêtre
+            beta: borne supérieure de la fenêtre
+            depth: profondeur restant à chercher
+            ply: distance à la racine
+
+        Returns:
+            (évaluation, meilleur coup)
+        """
+        metrics = self.metrics
+        metrics["Number of states evaluated"] += 1
+
+        if self.stopRecherche or self.control.isOver():
+            self.stopRecherche = True
+            return 0, None
+
+        if state.isDone():
+            return self.terminalScore(state, state.getSide()), None
+
+        if depth <= 0:
+            if -depth >= self.quiescenceDepth:
+                return self.evaluate(state, alpha, beta, ply), None
+            # La position est calme si aucune bille adverse ne peut être éjectée
+            if not state.hasCapture():
+                return self.evaluate(state, alpha, beta, ply), None
+            metrics["Number of extend quiescent"] += 1
+
+        ttMove = None
+        if self.transpoTable is not None:
+            entry = self.transpoTable.getEntry(state)
+            if entry is not None:
+                ttScore, ttMove, ttFlag, ttDepth, _ = entry
+                # A la racine on a besoin d'un coup, on ne s'arrête donc pas sur l'entrée de la table
+                if ply > 0 and ttDepth >= depth:
+                    if ttFlag == 'exact' \
+                            or (ttFlag == 'lowerbound' and ttScore >= beta) \
+                            or (ttFlag == 'upperbound' and ttScore <= alpha):
+                        metrics["Number of transpostion"] += 1
+                        return ttScore, ttMove
+
+        alphaOrigin = alpha
+        bestEval = -infinity
+        bestMove = None
+
+        if self.moveOrdering is not None:
+            moves = MovePicker(state, ttMove, ply, self.moveOrdering)
+        else:
+            moves = self.orderMoves(state.generateMoves(), ttMove, ply, state.getSide())
+        batchFrontier = depth == 1 and self.batchEvaluator is not None and not self.quiescenceDepth
+        usedFrontier = False
+        for i, move in enumerate(moves):
+            if batchFrontier and i == 1:
+                # Le premier coup n'a pas provoqué de coupure : les autres fils sont évalués ensemble
+                evaluation, move = self.searchFrontier(state, bestMove, beta, ply)
+                usedFrontier = True
+            else:
+                evaluation = self.searchMove(state, move, alpha, beta, depth, ply, i == 0)
+
+            # La recherche est stoppé, alors on ne sauvegarde pas ce résultat et on sort
+            if self.stopRecherche or move is None:
+                break
+
+            if evaluation > bestEval:
+                bestEval = evaluation
+                bestMove = move
+                alpha = max(alpha, evaluation)
+
+            if bestEval >= beta:
+                metrics["Number of prunings"] += 1
+                if self.moveOrdering is not None:
+                    self.moveOrdering.onCutoff(move, ply, state.getSide(), depth)
+                break
+
+            if batchFrontier and i == 1:
+                break
+
+        # Coupure avant d'avoir eu besoin de générer les coups calmes (searchFrontier les génère tous)
+        if isinstance(moves, MovePicker) and moves.stage < MovePicker.QUIETS and not usedFrontier:
+            metrics["Quiet generations avoided"] += 1
+
+        if bestEval >= beta:
+            flag = 'lowerbound'
+        elif bestEval <= alphaOrigin:
+            flag = 'upperbound'
+        else:
+            flag = 'exact'
+        self.storeEntry(state, bestEval, bestMove, flag, depth)
+
+        return bestEval, bestMove
+
+    def searchMove(self, state: SearchState, move: int, alpha: float, beta: float, depth: int, ply: int,
+                   fullWindow: bool) -> float:
+        """
+        Joue un coup, cherche la position obtenue et annule le coup
+
+        Args:
+            state: état de recherche
+            move: coup à étudier
+            alpha: borne inférieure de la fenêtre
+            beta: borne supérieure de la fenêtre
+            depth: profondeur restant à chercher sous le noeud
+            ply: distance du noeud à la racine
+            fullWindow: cherche avec la fenêtre complète (premier coup du noeud ou PVS désactivée)
+
+        Returns:
+            float: évaluation du coup
+        """
+        token = state.makeMove(move)
+        if fullWindow or not self.usePvs:
+            evaluation = -self.negamax(state, -beta, -alpha, depth - 1, ply + 1)[0]
+        else:
+            # On cherche seulement à prouver que le coup est moins bon que le meilleur actuel
+            evaluation = -self.negamax(state, -alpha - NULL_WINDOW, -alpha, depth - 1, ply + 1)[0]
+            if alpha < evaluation < beta and not self.stopRecherche:
+                self.metrics["Number of re-searches"] += 1
+                evaluation = -self.negamax(state, -beta, -alpha, depth - 1, ply + 1)[0]
+        state.unmakeMove(token)
+        return evaluation
+
+    def storeEntry(self, state: SearchState, evaluation: float, move: Optional[int], flag: str, depth: int) -> None:
+        """
+        Ajoute l'entrée dans la table de transposition (sauf si la recherche a été interrompue)
+        """
+        if self.transpoTable is not None and not self.stopRecherche:
+            self.transpoTable.addEntry(state, evaluation, move, flag, depth)
+
+    @staticmethod
+    def terminalScore(state: SearchState, side: int) -> float:
+        """
+        Évaluation d'une position de fin de partie pour le joueur side
+        """
+        winner = state.getWinner()
+        if winner == DRAW:
+            return 0
+        return WIN_SCORE if winner == side else -WIN_SCORE
+
+    def searchFrontier(self, state: SearchState, excludedMove: Optional[int], beta: float,
+                       ply: int) -> Tuple[float, Optional[int]]:
+        """
+        Noeud dont tous les fils sont des feuilles : chaque coup est joué le temps de relever la position obtenue, puis
+        toutes les positions sont évaluées en un seul appel à batchEvaluator.
+
+        Les évaluations sont ensuite parcourues dans l'ordre de moveOrdering, en s'arrêtant au premier coup qui atteint
+        beta : le résultat est celui de la recherche coup par coup, et seuls les fils qu'elle aurait visités sont
+        comptés dans "Number of states evaluated".
+
+        Args:
+            state: état de recherche, modifié puis restauré
+            excludedMove: coup déjà étudié
+            beta: borne supérieure de la fenêtre
+            ply: distance du noeud à la racine
+
+        Returns:
+            (meilleure évaluation, meilleur coup), (-infinity, None) s'il n'y a aucun autre coup
+        """
+        side = state.getSide()
+        moves = [move for move in state.generateMoves() if move != excludedMove]
+        if not moves:
+            return -infinity, None
+        moves = self.orderMoves(moves, None, ply, side)
+        masks = [[], []]
+        lost = [[], []]
+        terminal = {}
+        for i, move in enumerate(moves):
+            token = state.makeMove(move)
+            if state.isDone():
+                terminal[i] = self.terminalScore(state, side)
+            masks[WHITE].append(state.masks[WHITE])
+            masks[BLACK].append(state.masks[BLACK])
+            lost[WHITE].append(state.lost[WHITE])
+            lost[BLACK].append(state.lost[BLACK])
+            state.unmakeMove(token)
+
+        # Les fils sont évalués du point de vue du joueur du noeud : c'est directement la valeur negamax du coup
+        evaluations = self.batchEvaluator(masks, lost, side)
+        for i, score in terminal.items():
+            evaluations[i] = score
+        bestEval = -infinity
+        bestMove = None
+        nbVisited = 0
+        for move, evaluation in zip(moves, evaluations.tolist()):
+            nbVisited += 1
+            if evaluation > bestEval:
+                bestEval = evaluation
+                bestMove = move
+                if bestEval >= beta:
+                    break
+        self.metrics["Number of states evaluated"] += nbVisited
+        return bestEval, bestMove
+
+    def searchRoot(self, state: SearchState, depth: int, previousEval: Optional[float]) -> Tuple[float, Optional[int]]:
+        """
+        Recherche à une profondeur fixe, avec une fenêtre d'aspiration autour de l'évaluation précédente
+
+        Args:
+            state: état de recherche
+            depth: profondeur de l'itération
+            previousEval: évaluation de l'itération précédente (None pour une fenêtre complète)
+
+        Returns:
+            (évaluation, meilleur coup)
+        """
+        if previousEval is None or not self.aspirationWindow or abs(previousEval) >= WIN_SCORE:
+            return self.negamax(state, -infinity, infinity, depth, 0)
+
+        alpha = previousEval - self.aspirationWindow
+        beta = previousEval + self.aspirationWindow
+        while True:
+            evaluation, move = self.negamax(state, alpha, beta, depth, 0)
+            if self.stopRecherche:
+                return evaluation, move
+            # Échec de la fenêtre : on l'ouvre entièrement du côté où la valeur est sortie
+            if evaluation <= alpha:
+                self.metrics["Aspiration fails"] += 1
+                alpha = -infinity
+            elif evaluation >= beta:
+                self.metrics["Aspiration fails"] += 1
+                beta = infinity
+            else:
+                return evaluation, move
+
+    def getPrincipalVariation(self, state: SearchState, maxLength: int) -> List[int]:
+        """
+        Reconstruit la variation principale en suivant les meilleurs coups de la table de transposition
+
+        Args:
+            state: état de recherche à la racine
+            maxLength: nombre maximal de coups
+
+        Returns:
+            List[int]: coups encodés de la variation principale
+        """
+        pv = []
+        if self.transpoTable is None:
+            return pv
+        tokens = []
+        seen = set()
+        while len(pv) < maxLength and not state.isDone() and state.getHash() not in seen:
+            seen.add(state.getHash())
+            entry = self.transpoTable.getEntry(state)
+            # On vérifie que le coup est jouable : l'entrée peut venir d'une autre position ayant le même index
+            if entry is None or entry[1] is None or not state.isLegal(entry[1]):
+                break
+            pv.append(entry[1])
+            tokens.append(state.makeMove(entry[1]))
+        for token in reversed(tokens):
+            state.unmakeMove(token)
+        return pv
+
+    def startSearch(self, state: Union[GameStateAbalone, SearchState], maxTime: float,
+                    newRoot: bool = True) -> SearchState:
+        """
+        Prépare une nouvelle recherche : démarre le chronomètre, remet les compteurs à zéro et construit l'état de
+        recherche
+
+        Args:
+            state: état de la partie (ou état de recherche)
+            maxTime: temps alloué à la recherche (s)
+            newRoot: False si la racine est celle de la recherche précédente (tâches successives d'un processus de
+                ParallelSearch) : les killers et l'historique de moveOrdering sont alors conservés tels quels
+
+        Returns:
+            SearchState: état de recherche à la racine
+        """
+        self.control.start(maxTime)
+        self.startTime = self.control.startTime
+        self.maxTime = maxTime
+        self.stopRecherche = False
+        self.metrics = {
+            "Number of states evaluated": 0,
+            "Number of prunings": 0,
+            "Number of transpostion": 0,
+            "Number of re-searches": 0,
+            "Aspiration fails": 0,
+            "Number of extend quiescent": 0,
+            "Quiet generations avoided": 0,
+            "Lazy evaluations": 0,
+            }
+        if isinstance(state, SearchState):
+            searchState = state
+        else:
+            searchState = SearchState.fromGameState(state, positionScore=self.positionScore)
+        if self.moveOrdering is not None and newRoot:
+            self.moveOrdering.newSearch()
+        if self.transpoTable is not None:
+            self.transpoTable.resetCounters()
+        if self.evaluationCache is not None:
+            self.evaluationCache.resetCounters()
+        return searchState
+
+    def search(self, state: Union[GameStateAbalone, SearchState], maxTime: float,
+               startDepth: int = 1) -> Tuple[float, Optional[int], dict]:
+        """
+        Approfondissement itératif jusqu'à maxDepth ou jusqu'à la fin du temps alloué
+
+        Args:
+            state: état de la partie (ou état de recherche)
+            maxTime: temps alloué à la recherche (s)
+            startDepth: profondeur de la première itération
+
+        Returns:
+            Tuple containing the best evaluation, the best move (encoded, see move.py), and metrics.
+        """
+        searchState = self.startSearch(state, maxTime)
+        return self.iterativeDeepening(searchState, startDepth)
+
+    def iterativeDeepening(self, searchState: SearchState, startDepth: int = 1) -> Tuple[float, Optional[int], dict]:
+        """
+        Itérations de profondeur croissante d'une recherche déjà préparée par startSearch
+
+        Args:
+            searchState: état de recherche à la racine, renvoyé par startSearch
+            startDepth: profondeur de la première itération
+
+        Returns:
+            Tuple containing the best evaluation, the best move (encoded, see move.py), and metrics.
+        """
+        bestEval = None
+        bestMove = None
+        maxDepthFinished = 0
+        for depth in range(startDepth, self.maxDepth + 1):
+            # Inutile de commencer une itération qui ne sera vraisemblablement pas terminée
+            if bestMove is not None and self.timeManager is not None and not self.timeManager.shouldStartIteration():
+                break
+            evaluation, move = self.searchRoot(searchState, depth, bestEval)
+            if self.stopRecherche:
+                # Une itération interrompue n'est utilisée que si aucune itération n'a été terminée
+                if bestMove is None:
+                    bestEval, bestMove = evaluation, move
+                break
+            bestEval, bestMove = evaluation, move
+            maxDepthFinished = depth
+            if self.timeManager is not None:
+                self.timeManager.onIterationFinished(bestEval, bestMove)
+            # Inutile d'aller plus loin si la fin de partie est certaine
+            if abs(bestEval) >= WIN_SCORE:
+                break
+
+        self.finishSearch(searchState, maxDepthFinished)
+        return bestEval, bestMove, self.metrics
+
+    def finishSearch(self, searchState: SearchState, maxDepthFinished: int) -> None:
+        """
+        Complète les métriques à la fin d'une recherche
+
+        Args:
+            searchState: état de recherche à la racine
+            maxDepthFinished: profondeur de la dernière itération terminée
+        """
+        self.metrics["Elapsed time (s)"] = round(time.time() - self.startTime, 2)
+        self.metrics["Max depth finished"] = maxDepthFinished
+        self.metrics["Clock checks"] = self.control.nbChecks
+        if self.timeManager is not None:
+            self.metrics["Soft limit (s)"] = round(self.timeManager.getSoftLimit(), 2)
+            self.metrics["Hard limit (s)"] = round(self.timeManager.getHardLimit(), 2)
+        if self.evaluationCache is not None:
+            self.metrics["Evaluation cache hits"] = self.evaluationCache.getNbHits()
+            self.metrics["Evaluation cache misses"] = self.evaluationCache.getNbMisses()
+        if self.transpoTable is not None:
+            self.metrics["Number of overwrites"] = self.transpoTable.getNbOverwrites()
+            self.metrics["Taille de la table"] = self.transpoTable.getLenTable()
+            self.metrics["Entrées réutilisées"] = self.transpoTable.getNbReused()
+            self.metrics["Principal variation"] = self.getPrincipalVariation(searchState, maxDepthFinished)
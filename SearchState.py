@@ -0,0 +1,451 @@
+from typing import List, Optional, Tuple
+
+from game_state_abalone import GameStateAbalone
+
+import bitboard
+import move as mv
+from bitboard import WHITE, BLACK, OFF_BOARD
+
+# Nombre de billes perdues qui termine la partie (GameStateAbalone.max_score = -6)
+MAX_LOST = 6
+# Valeur retournée par getWinner en cas d'égalité parfaite
+DRAW = -1
+
+
+class SearchState:
+    """
+        État de jeu mutable utilisé par la recherche.
+
+        Contrairement à GameStateAbalone, qui construit un nouvel état (et un nouveau plateau) pour chaque action
+        possible, cet état est modifié sur place : makeMove applique un coup et renvoie de quoi l'annuler, unmakeMove
+        restaure l'état précédent. Une seule instance est donc parcourue par toute la recherche.
+
+        Les coups sont encodés en entiers (voir move.py) : la bille d'origine pousse devant elle toutes les billes
+        alignées dans la direction, comme dans GameStateAbalone.detect_conflict.
+
+        Les déplacements latéraux (un groupe de 2 ou 3 billes alignées qui se déplace hors de son axe) font partie des
+        règles d'Abalone mais pas de celles de GameStateAbalone, qui les refuse. Ils ne sont générés que si
+        allowBroadside est vrai, par exemple pour étudier le facteur de branchement des vraies règles.
+
+        Attributes:
+            masks: bitboards des billes [blanches, noires]
+            side: couleur du joueur qui doit jouer
+            lost: nombre de billes perdues par couleur
+            step: numéro du tour actuel
+            maxStep: nombre de tours maximal de la partie
+            hash: hash de Zobrist de la position, mis à jour à chaque coup. À moins de bitboard.STEP_HORIZON tours de
+                maxStep, il contient aussi le nombre de tours restants : une entrée de table de transposition cherchée
+                à un autre tour (par exemple pendant la réflexion sur le tour de l'adversaire) ne peut pas être
+                réutilisée alors que l'horizon de fin de partie a changé
+            allowBroadside: génère aussi les déplacements latéraux
+            positionScore: score de position de chaque case (par exemple heuristique.POSITION_SCORE_V2_CELLS). S'il
+                est donné, positionSums et lonelyCounts sont tenus à jour à chaque coup
+            positionSums: somme des scores de position des billes de chaque couleur
+            lonelyCounts: nombre de billes isolées (sans voisine alliée) de chaque couleur
+    """
+
+    def __init__(self, masks: List[int], side: int, lost: List[int], step: int, maxStep: int = 50,
+                 allowBroadside: bool = False, positionScore: Optional[List[int]] = None):
+        self.masks = list(masks)
+        self.side = side
+        self.lost = list(lost)
+        self.step = step
+        self.maxStep = maxStep
+        self.allowBroadside = allowBroadside
+        self.hash = bitboard.zobristHash(self.masks, self.side) ^ bitboard.stepKey(maxStep - step)
+        self.positionScore = positionScore
+        self.positionSums = [0, 0]
+        self.lonelyCounts = [0, 0]
+        if positionScore is not None:
+            for colour, mask in enumerate(self.masks):
+                self.positionSums[colour] = sum(positionScore[cell] for cell in bitboard.iterCells(mask))
+                self.lonelyCounts[colour] = self._countLonely(mask, mask)
+
+    @classmethod
+    def fromGameState(cls, state: GameStateAbalone, allowBroadside: bool = False,
+                      positionScore: Optional[List[int]] = None) -> 'SearchState':
+        """
+        Construit l'état de recherche correspondant à un état de la partie
+
+        Args:
+            state: état de la partie
+            allowBroadside: génère aussi les déplacements latéraux
+            positionScore: score de position de chaque case, pour tenir à jour les termes de l'évaluation
+
+        Returns:
+            SearchState: état de recherche équivalent
+        """
+        lost = [0, 0]
+        for player in state.get_players():
+            lost[bitboard.colourIndex(player.get_piece_type())] = -state.get_player_score(player)
+        return cls(
+            bitboard.envToBitboards(state.get_rep().get_env()),
+            bitboard.colourIndex(state.get_next_player().get_piece_type()),
+            lost,
+            state.get_step(),
+            state.max_step,
+            allowBroadside,
+            positionScore
+            )
+
+    def copy(self) -> 'SearchState':
+        return SearchState(self.masks, self.side, self.lost, self.step, self.maxStep, self.allowBroadside,
+                           self.positionScore)
+
+    def encode(self) -> Tuple[int, ...]:
+        """
+        Encodage compact de l'état (8 entiers), pour le transmettre à un autre processus sans sérialiser de
+        GameStateAbalone. positionScore n'en fait pas partie : c'est une table constante que le processus qui décode
+        possède déjà.
+
+        Returns:
+            Tuple[int, ...]: (blancs, noirs, side, perdues blancs, perdues noirs, step, maxStep, allowBroadside)
+        """
+        return (self.masks[WHITE], self.masks[BLACK], self.side, self.lost[WHITE], self.lost[BLACK], self.step,
+                self.maxStep, int(self.allowBroadside))
+
+    @classmethod
+    def decode(cls, data: Tuple[int, ...], positionScore: Optional[List[int]] = None) -> 'SearchState':
+        """
+        Reconstruit un état encodé par encode
+
+        Args:
+            data: état encodé
+            positionScore: score de position de chaque case, pour tenir à jour les termes de l'évaluation
+
+        Returns:
+            SearchState: état de recherche
+        """
+        white, black, side, lostWhite, lostBlack, step, maxStep, allowBroadside = data
+        return cls([white, black], side, [lostWhite, lostBlack], step, maxStep, bool(allowBroadside), positionScore)
+
+    @staticmethod
+    def _countLonely(mask: int, region: int) -> int:
+        """
+        Nombre de billes de mask situées dans region qui n'ont aucune bille de mask pour voisine
+        """
+        count = 0
+        for cell in bitboard.iterCells(mask & region):
+            if not mask & bitboard.NEIGHBOUR_MASKS[cell]:
+                count += 1
+        return count
+
+    def _updateEvaluationTerms(self, oldMasks: Tuple[int, int]) -> None:
+        """
+        Met à jour positionSums et lonelyCounts après un coup. Seules les cases modifiées par le coup (au plus 6) et
+        leurs voisines peuvent changer de score ou d'isolement : on ne recompte que cette région.
+
+        Args:
+            oldMasks: masques [blancs, noirs] avant le coup
+        """
+        positionScore = self.positionScore
+        for colour in (WHITE, BLACK):
+            old = oldMasks[colour]
+            new = self.masks[colour]
+            changed = old ^ new
+            if not changed:
+                continue
+            region = changed
+            for cell in bitboard.iterCells(changed):
+                score = positionScore[cell]
+                self.positionSums[colour] += score if new >> cell & 1 else -score
+                region |= bitboard.NEIGHBOUR_MASKS[cell]
+            self.lonelyCounts[colour] += self._countLonely(new, region) - self._countLonely(old, region)
+
+    def getSide(self) -> int:
+        return self.side
+
+    def getStep(self) -> int:
+        return self.step
+
+    def getHash(self) -> int:
+        return self.hash
+
+    def isDone(self) -> bool:
+        """
+        Même condition de fin que GameStateAbalone.is_done
+        """
+        return self.step >= self.maxStep or self.lost[WHITE] >= MAX_LOST or self.lost[BLACK] >= MAX_LOST
+
+    def getWinner(self) -> int:
+        """
+        Couleur du gagnant selon les règles de MasterAbalone.compute_winner : le joueur ayant perdu le moins de billes,
+        puis en cas d'égalité celui dont les billes sont le plus proche du centre.
+
+        Returns:
+            int: couleur du gagnant, DRAW en cas d'égalité parfaite
+        """
+        if self.lost[WHITE] != self.lost[BLACK]:
+            return WHITE if self.lost[WHITE] < self.lost[BLACK] else BLACK
+        dist = [sum(bitboard.CENTRE_DISTANCE[cell] for cell in bitboard.iterCells(mask)) for mask in self.masks]
+        if dist[WHITE] == dist[BLACK]:
+            return DRAW
+        return WHITE if dist[WHITE] < dist[BLACK] else BLACK
+
+    def _walkLine(self, origin: int, direction: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Parcourt la ligne de billes qui part de origin dans la direction donnée et vérifie que la poussée est valide
+
+        Args:
+            origin: case de la bille qui pousse
+            direction: direction du coup
+
+        Returns:
+            (nombre de billes alliées, nombre de billes adverses poussées, case derrière la ligne) ou None si le coup
+            n'est pas valide
+        """
+        own = self.masks[self.side]
+        other = self.masks[1 - self.side]
+        nbOwn = 1
+        nbOther = 0
+        for cell in bitboard.RAYS[origin][direction]:
+            bit = 1 << cell
+            if own & bit:
+                # Une bille alliée derrière des billes adverses bloque la poussée
+                if nbOther:
+                    return None
+                nbOwn += 1
+                if nbOwn > 3:
+                    return None
+            elif other & bit:
+                nbOther += 1
+                if nbOther >= nbOwn:
+                    return None
+            else:
+                return nbOwn, nbOther, cell
+        # Le rayon s'arrête au bord du plateau
+        return nbOwn, nbOther, OFF_BOARD
+
+    def hasCapture(self) -> bool:
+        """
+        Vrai si le joueur qui doit jouer peut éjecter une bille adverse. Seules les billes adverses du bord sont
+        étudiées : on remonte la ligne depuis le bord vers l'intérieur du plateau, sans générer les coups.
+
+        Returns:
+            bool: True si un coup du joueur est une capture
+        """
+        own = self.masks[self.side]
+        other = self.masks[1 - self.side]
+        for cell in bitboard.iterCells(other & bitboard.EDGE_MASK):
+            for direction in range(bitboard.NB_DIRECTIONS):
+                # La bille sortirait du plateau dans cette direction
+                if bitboard.NEIGHBOURS[cell][direction] != OFF_BOARD:
+                    continue
+                nbOther = 1
+                nbOwn = 0
+                for behind in bitboard.RAYS[cell][(direction + 3) % bitboard.NB_DIRECTIONS]:
+                    bit = 1 << behind
+                    if other & bit and not nbOwn:
+                        nbOther += 1
+                        if nbOther > 2:
+                            break
+                    elif own & bit:
+                        nbOwn += 1
+                        if nbOwn > nbOther:
+                            return True
+                    else:
+                        break
+        return False
+
+    def generateCaptures(self) -> List[int]:
+        """
+        Génère uniquement les coups qui éjectent une bille adverse, en remontant les lignes depuis les billes adverses
+        du bord comme hasCapture. Les coups sont encodés comme ceux de generateMoves.
+
+        Returns:
+            List[int]: liste des captures encodées
+        """
+        own = self.masks[self.side]
+        other = self.masks[1 - self.side]
+        captures = []
+        for cell in bitboard.iterCells(other & bitboard.EDGE_MASK):
+            for direction in range(bitboard.NB_DIRECTIONS):
+                if bitboard.NEIGHBOURS[cell][direction] != OFF_BOARD:
+                    continue
+                nbOther = 1
+                nbOwn = 0
+                for behind in bitboard.RAYS[cell][(direction + 3) % bitboard.NB_DIRECTIONS]:
+                    bit = 1 << behind
+                    if other & bit and not nbOwn:
+                        nbOther += 1
+                        if nbOther > 2:
+                            break
+                    elif own & bit:
+                        nbOwn += 1
+                        if nbOwn > 3:
+                            break
+                        # Chaque bille alliée assez loin du bord peut pousser la ligne qui est devant elle
+                        if nbOwn > nbOther:
+                            captures.append(mv.encodeMove(behind, direction, nbOwn, nbOther, True))
+                    else:
+                        break
+        return captures
+
+    def isLegal(self, move: int) -> bool:
+        """
+        Vérifie qu'un coup (par exemple celui de la table de transposition, qui peut venir d'une autre position ayant
+        le même index) est jouable dans la position
+
+        Args:
+            move: coup encodé
+
+        Returns:
+            bool: True si le coup est jouable
+        """
+        own = self.masks[self.side]
+        if not own >> mv.getOrigin(move) & 1:
+            return False
+        if mv.isBroadside(move):
+            if not self.allowBroadside:
+                return False
+            occupied = own | self.masks[1 - self.side]
+            direction = mv.getDirection(move)
+            for cell in mv.getBroadsideCells(move):
+                destination = bitboard.NEIGHBOURS[cell][direction]
+                if not own >> cell & 1 or destination == OFF_BOARD or occupied >> destination & 1:
+                    return False
+            return True
+        line = self._walkLine(mv.getOrigin(move), mv.getDirection(move))
+        if line is None:
+            return False
+        nbOwn, nbOther, behind = line
+        return (nbOwn == mv.getNbOwn(move) and nbOther == mv.getNbPushed(move)
+                and (behind == OFF_BOARD) == mv.isEjecting(move))
+
+    def generateMoves(self) -> List[int]:
+        """
+        Génère les coups possibles du joueur qui doit jouer, chaque position suivante n'étant produite qu'une fois
+
+        Returns:
+            List[int]: liste des coups encodés
+        """
+        moves = []
+        for origin in bitboard.iterCells(self.masks[self.side]):
+            # Toutes les éjections de nos propres billes depuis une même origine mènent à la même position (la case
+            # d'origine se vide, les autres billes de la ligne restent en place à une case près) : on n'en garde qu'une
+            suicide = False
+            for direction in range(bitboard.NB_DIRECTIONS):
+                line = self._walkLine(origin, direction)
+                if line is not None:
+                    nbOwn, nbOther, behind = line
+                    if behind == OFF_BOARD and not nbOther:
+                        if suicide:
+                            continue
+                        suicide = True
+                    # behind est la case où arrive la dernière bille de la ligne (bille adverse si on pousse)
+                    moves.append(mv.encodeMove(origin, direction, nbOwn, nbOther, behind == OFF_BOARD,
+                                               behind != OFF_BOARD and bool(bitboard.EDGE_MASK >> behind & 1)))
+        if self.allowBroadside:
+            moves.extend(self.generateBroadsideMoves())
+        return moves
+
+    def generateBroadsideMoves(self) -> List[int]:
+        """
+        Génère les déplacements latéraux du joueur qui doit jouer à partir des groupes précalculés (bitboard.GROUPS) :
+        un groupe est déplaçable si toutes ses cases contiennent nos billes et toutes ses cases d'arrivée sont vides.
+
+        Returns:
+            List[int]: liste des coups encodés
+        """
+        own = self.masks[self.side]
+        occupied = own | self.masks[1 - self.side]
+        moves = []
+        for anchor in bitboard.iterCells(own):
+            for groupMask, lineIndex, size, targets in bitboard.GROUPS[anchor]:
+                if own & groupMask != groupMask:
+                    continue
+                for direction, targetMask in targets:
+                    if not occupied & targetMask:
+                        moves.append(mv.encodeBroadside(anchor, direction, size, lineIndex))
+        return moves
+
+    def makeMove(self, move: int) -> Tuple[int, ...]:
+        """
+        Applique un coup sur l'état. Le hash de Zobrist est mis à jour en ne modifiant que les cases touchées par le
+        coup et la clé du joueur qui doit jouer, de même que les termes de l'évaluation si positionScore est donné.
+
+        Args:
+            move: coup encodé à jouer
+
+        Returns:
+            Tuple: jeton permettant d'annuler le coup avec unmakeMove
+        """
+        token = (self.masks[WHITE], self.masks[BLACK], self.lost[WHITE], self.lost[BLACK], self.hash,
+                 self.positionSums[WHITE], self.positionSums[BLACK], self.lonelyCounts[WHITE], self.lonelyCounts[BLACK])
+        if mv.isBroadside(move):
+            self._makeBroadside(move)
+            if self.positionScore is not None:
+                self._updateEvaluationTerms(token)
+            return token
+        origin = mv.getOrigin(move)
+        direction = mv.getDirection(move)
+        nbOwn = mv.getNbOwn(move)
+        nbOther = mv.getNbPushed(move)
+        side = self.side
+        other = 1 - side
+        ownKeys = bitboard.ZOBRIST_KEYS[side]
+        otherKeys = bitboard.ZOBRIST_KEYS[other]
+        ray = bitboard.RAYS[origin][direction]
+
+        # La ligne avance d'une case : la case d'origine se libère et la case devant la ligne alliée (première bille
+        # adverse ou case libre) se remplit
+        self.masks[side] &= ~(1 << origin)
+        h = self.hash ^ ownKeys[origin] ^ bitboard.ZOBRIST_SIDE
+        if nbOther:
+            front = ray[nbOwn - 1]
+            self.masks[side] |= 1 << front
+            self.masks[other] &= ~(1 << front)
+            h ^= ownKeys[front] ^ otherKeys[front]
+            if mv.isEjecting(move):
+                self.lost[other] += 1
+            else:
+                behind = ray[nbOwn + nbOther - 1]
+                self.masks[other] |= 1 << behind
+                h ^= otherKeys[behind]
+        elif mv.isEjecting(move):
+            self.lost[side] += 1
+        else:
+            front = ray[nbOwn - 1]
+            self.masks[side] |= 1 << front
+            h ^= ownKeys[front]
+
+        if self.maxStep - self.step <= bitboard.STEP_HORIZON + 1:
+            h ^= bitboard.stepKey(self.maxStep - self.step) ^ bitboard.stepKey(self.maxStep - self.step - 1)
+        self.hash = h
+        self.side = other
+        self.step += 1
+        if self.positionScore is not None:
+            self._updateEvaluationTerms(token)
+        return token
+
+    def _makeBroadside(self, move: int) -> None:
+        """
+        Applique un déplacement latéral : chaque bille du groupe avance d'une case dans la direction du coup
+        """
+        side = self.side
+        keys = bitboard.ZOBRIST_KEYS[side]
+        direction = mv.getDirection(move)
+        h = self.hash ^ bitboard.ZOBRIST_SIDE
+        mask = self.masks[side]
+        for cell in mv.getBroadsideCells(move):
+            destination = bitboard.NEIGHBOURS[cell][direction]
+            mask ^= (1 << cell) | (1 << destination)
+            h ^= keys[cell] ^ keys[destination]
+        self.masks[side] = mask
+        if self.maxStep - self.step <= bitboard.STEP_HORIZON + 1:
+            h ^= bitboard.stepKey(self.maxStep - self.step) ^ bitboard.stepKey(self.maxStep - self.step - 1)
+        self.hash = h
+        self.side = 1 - side
+        self.step += 1
+
+    def unmakeMove(self, token: Tuple[int, ...]) -> None:
+        """
+        Annule le dernier coup joué
+
+        Args:
+            token: jeton renvoyé par makeMove
+        """
+        (self.masks[WHITE], self.masks[BLACK], self.lost[WHITE], self.lost[BLACK], self.hash,
+         self.positionSums[WHITE], self.positionSums[BLACK], self.lonelyCounts[WHITE], self.lonelyCounts[BLACK]) = token
+        self.side = 1 - self.side
+        self.step -= 1
@@ -0,0 +1,327 @@
+import mmap
+import os
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ArrayTranspositionTable import DEPTH_PREFERRED, ALWAYS_REPLACE, TWO_TIER, POLICIES, FLAGS, FLAG_CODES
+from SearchState import SearchState
+from move import NO_MOVE
+
+# Une entrée est formée de 2 mots de 64 bits : les données compactées, puis la clé XOR les données
+ENTRY_WORDS = 2
+ENTRY_SIZE = 8 * ENTRY_WORDS
+
+# Position des champs dans le mot de données
+SCORE_BITS = 20
+MOVE_BITS = 18  # move.LINE_SHIFT + 2 bits d'index de ligne
+DEPTH_BITS = 8
+FLAG_BITS = 2
+AGE_BITS = 8
+SCORE_SHIFT = 0
+MOVE_SHIFT = SCORE_SHIFT + SCORE_BITS
+DEPTH_SHIFT = MOVE_SHIFT + MOVE_BITS
+FLAG_SHIFT = DEPTH_SHIFT + DEPTH_BITS
+AGE_SHIFT = FLAG_SHIFT + FLAG_BITS
+
+SCORE_MASK = (1 << SCORE_BITS) - 1
+MOVE_MASK = (1 << MOVE_BITS) - 1
+DEPTH_MASK = (1 << DEPTH_BITS) - 1
+FLAG_MASK = (1 << FLAG_BITS) - 1
+AGE_MASK = (1 << AGE_BITS) - 1
+
+# Les scores et profondeurs sont stockés décalés pour être positifs : un mot de données n'est donc jamais nul, et un
+# mot nul marque une case vide
+SCORE_OFFSET = 1 << (SCORE_BITS - 1)
+SCORE_LIMIT = SCORE_OFFSET - 1
+DEPTH_OFFSET = 1 << (DEPTH_BITS - 1)
+EMPTY_DATA = 0
+
+
+def packEntry(score: float, move: int, depth: int, flagCode: int, age: int) -> int:
+    """
+    Compacte les champs d'une entrée dans un mot de 64 bits. Le score est arrondi à l'entier et borné à
+    ±SCORE_LIMIT (les heuristiques et WIN_SCORE sont des entiers bien plus petits).
+    """
+    score = int(min(max(score, -SCORE_LIMIT), SCORE_LIMIT))
+    return ((score + SCORE_OFFSET) << SCORE_SHIFT | move << MOVE_SHIFT | (depth + DEPTH_OFFSET) << DEPTH_SHIFT
+            | flagCode << FLAG_SHIFT | age << AGE_SHIFT)
+
+
+def unpackEntry(data: int) -> Tuple[int, int, int, int, int]:
+    """
+    Returns:
+        (score, coup, profondeur, index du type d'entrée, génération)
+    """
+    return (((data >> SCORE_SHIFT) & SCORE_MASK) - SCORE_OFFSET,
+            (data >> MOVE_SHIFT) & MOVE_MASK,
+            ((data >> DEPTH_SHIFT) & DEPTH_MASK) - DEPTH_OFFSET,
+            (data >> FLAG_SHIFT) & FLAG_MASK,
+            (data >> AGE_SHIFT) & AGE_MASK)
+
+
+class SharedTranspositionTable:
+    """
+        Table de transposition partageable entre processus, sans verrou.
+
+        Les entrées sont rangées dans un bloc multiprocessing.shared_memory, ou dans un fichier projeté en mémoire
+        (mmap) si path est donné. Chaque entrée tient en 2 mots de 64 bits : les données (score, coup, profondeur, type
+        et génération, voir packEntry) et la clé de la position XOR les données. Plusieurs processus peuvent écrire la
+        même entrée en même temps sans verrou : si leurs écritures se mélangent, le second mot ne correspond plus au
+        premier, la vérification (clé == second mot XOR données) échoue à la lecture et l'entrée est simplement
+        ignorée. Une lecture ne renvoie donc jamais les données d'une autre position.
+
+        L'interface est celle de ArrayTranspositionTable (addEntry, getEntry, newSearch, sweep, mêmes politiques de
+        remplacement). Le score est stocké comme un entier.
+
+        La génération (age) et les compteurs (nbOverwrites, nbReused) restent propres à chaque processus : le
+        processus qui a créé la table appelle newSearch et sweep, et transmet sa génération aux autres.
+
+        Un autre processus ouvre la même table avec le nom du bloc (getName), ou, plus simplement, en recevant la table
+        par pickle (multiprocessing, ProcessPoolExecutor). Un bloc shared_memory ouvert par un processus qui n'a pas été
+        créé par multiprocessing depuis le créateur risque d'être détruit à son arrêt : dans ce cas (tâches d'analyse
+        indépendantes), on utilise plutôt un fichier, qui est conservé après la fermeture de la table.
+
+        Args:
+            sizeLog2: log2 du nombre d'entrées. Default is 20 (16 Mo).
+            policy: politique de remplacement (voir ArrayTranspositionTable)
+            name: nom d'un bloc shared_memory existant à ouvrir, None pour en créer un nouveau
+            path: fichier projeté en mémoire contenant la table, créé s'il n'existe pas. Remplace shared_memory.
+
+        Attributes:
+            size: nombre d'entrées de la table
+            age: génération actuelle
+            entries: mots de 64 bits de la table (2 par entrée)
+            isOwner: True si la table a créé le bloc shared_memory (et doit le détruire)
+            nbOverwrites: nombre d'entrées écrasées par une autre position dans ce processus depuis le dernier
+                resetCounters
+            nbReused: nombre d'entrées lues dans ce processus qui proviennent d'une recherche précédente, depuis le
+                dernier resetCounters
+    """
+
+    def __init__(self, sizeLog2: int = 20, policy: str = DEPTH_PREFERRED, name: Optional[str] = None,
+                 path: Optional[str] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"Politique de remplacement inconnue : {policy}")
+        self.sizeLog2 = sizeLog2
+        self.policy = policy
+        self.path = path
+        self.size = 1 << sizeLog2
+        # En TWO_TIER, l'index désigne un groupe de 2 entrées consécutives
+        self.indexMask = (self.size >> 1) - 1 if policy == TWO_TIER else self.size - 1
+
+        nbBytes = ENTRY_SIZE * self.size
+        self.sharedMemory = None
+        self.mappedFile = None
+        if path is not None:
+            self.isOwner = False
+            exists = os.path.exists(path)
+            with open(path, 'r+b' if exists else 'w+b') as file:
+                if not exists:
+                    file.truncate(nbBytes)
+                elif os.path.getsize(path) != nbBytes:
+                    raise ValueError(f"Le fichier {path} ne contient pas une table de 2^{sizeLog2} entrées")
+                self.mappedFile = mmap.mmap(file.fileno(), nbBytes)
+            self.buffer = memoryview(self.mappedFile)
+        else:
+            self.isOwner = name is None
+            # Les processus créés par multiprocessing partagent le resource_tracker du créateur : le bloc n'est
+            # détruit qu'à l'appel de close par le créateur (ou à l'arrêt de tous les processus)
+            self.sharedMemory = shared_memory.SharedMemory(name=name, create=self.isOwner, size=nbBytes)
+            self.buffer = self.sharedMemory.buf
+        self.entries = self.buffer.cast('Q')
+
+        self.age = 0
+        self.resetCounters()
+
+    def __reduce__(self):
+        # Transmise à un autre processus, la table y ouvre le même bloc (ou le même fichier)
+        name = self.sharedMemory.name if self.sharedMemory is not None else None
+        return SharedTranspositionTable, (self.sizeLog2, self.policy, name, self.path)
+
+    def getName(self) -> str:
+        return self.sharedMemory.name if self.sharedMemory is not None else self.path
+
+    def getLenTable(self) -> int:
+        # Les autres processus écrivent aussi dans la table : on compte les entrées occupées
+        return int(np.count_nonzero(self._entryArray()[:, 0]))
+
+    def getNbOverwrites(self) -> int:
+        return self.nbOverwrites
+
+    def getMaxLen(self) -> int:
+        return self.size
+
+    def getNbReused(self) -> int:
+        return self.nbReused
+
+    def isFull(self) -> bool:
+        return self.getLenTable() >= self.size
+
+    def resetCounters(self) -> None:
+        """
+        Remet à zéro les compteurs d'une recherche (nbOverwrites, nbReused) de ce processus
+        """
+        self.nbOverwrites = 0
+        self.nbReused = 0
+
+    def newSearch(self) -> None:
+        """
+        Passe à la génération suivante : les entrées des recherches précédentes restent lisibles mais sont remplacées
+        en priorité
+        """
+        self.age = (self.age + 1) & AGE_MASK
+
+    def _entryArray(self) -> np.ndarray:
+        # Vue numpy (sans copie) des entrées, une ligne (données, vérification) par entrée
+        return np.frombuffer(self.entries, dtype=np.uint64).reshape(-1, ENTRY_WORDS)
+
+    def clear(self) -> None:
+        self._entryArray()[:] = 0
+        self.nbOverwrites = 0
+        self.nbReused = 0
+
+    def sweep(self, maxAge: int = 2) -> int:
+        """
+        Vide les entrées écrites il y a plus de maxAge générations (voir ArrayTranspositionTable.sweep)
+
+        Returns:
+            int: nombre d'entrées supprimées
+        """
+        entries = self._entryArray()
+        data = entries[:, 0]
+        ages = ((data >> np.uint64(AGE_SHIFT)) & np.uint64(AGE_MASK)).astype(np.int16)
+        stale = (data != EMPTY_DATA) & (((self.age - ages) & AGE_MASK) > maxAge)
+        entries[stale] = 0
+        return int(np.count_nonzero(stale))
+
+    def _read(self, index: int) -> Tuple[int, int]:
+        """
+        Returns:
+            (clé, données) de l'entrée, clé 0 si l'entrée est vide
+        """
+        word = index << 1
+        data = self.entries[word]
+        return self.entries[word + 1] ^ data, data
+
+    def probe(self, key: int) -> Tuple[int, int]:
+        """
+        Cherche l'entrée d'une position
+
+        Args:
+            key: hash de Zobrist de la position
+
+        Returns:
+            (index de l'entrée, données), index -1 si la position n'est pas dans la table ou si l'entrée n'est pas
+            cohérente
+        """
+        if self.policy == TWO_TIER:
+            index = (key & self.indexMask) << 1
+            for candidate in (index, index + 1):
+                storedKey, data = self._read(candidate)
+                if storedKey == key and data != EMPTY_DATA:
+                    return candidate, data
+            return -1, EMPTY_DATA
+        index = key & self.indexMask
+        storedKey, data = self._read(index)
+        if storedKey == key and data != EMPTY_DATA:
+            return index, data
+        return -1, EMPTY_DATA
+
+    def _replacementIndex(self, key: int, depth: int) -> Tuple[int, int]:
+        """
+        Choisit l'entrée où écrire une position selon la politique de remplacement
+
+        Returns:
+            (index où écrire, -1 si l'entrée actuelle doit être conservée ; clé actuellement stockée)
+        """
+        index = key & self.indexMask
+        if self.policy == TWO_TIER:
+            index <<= 1
+        storedKey, data = self._read(index)
+        if self.policy == ALWAYS_REPLACE or storedKey == key or data == EMPTY_DATA:
+            return index, storedKey
+        _, _, storedDepth, _, storedAge = unpackEntry(data)
+        if storedAge != self.age or depth >= storedDepth:
+            return index, storedKey
+        if self.policy == TWO_TIER:
+            # L'entrée profonde est conservée, la position va dans l'entrée toujours remplacée
+            return index + 1, self._read(index + 1)[0]
+        return -1, storedKey
+
+    def store(self, key: int, estimateScore: float, bestMove: int, flagCode: int, depth: int) -> None:
+        """
+        Écrit une entrée dans la table : les données puis la vérification, sans verrou
+
+        Args:
+            key: hash de Zobrist de la position
+            estimateScore: évaluation de la position
+            bestMove: meilleur coup encodé (NO_MOVE si aucun)
+            flagCode: index du type d'entrée dans FLAGS
+            depth: profondeur restante de la recherche qui a produit l'évaluation
+        """
+        index, storedKey = self._replacementIndex(key, depth)
+        if index < 0:
+            return
+        if storedKey != key and self.entries[index << 1] != EMPTY_DATA:
+            self.nbOverwrites += 1
+        data = packEntry(estimateScore, bestMove, depth, flagCode, self.age)
+        word = index << 1
+        self.entries[word] = data
+        self.entries[word + 1] = key ^ data
+
+    def addEntry(self, state: SearchState, estimateScore: float, bestMove: Optional[int], flag: str,
+                 shearchDepth: int, previousBestMove: Optional[int] = None) -> None:
+        """
+        Même interface que TranspositionTable.addEntry. previousBestMove n'est pas conservé.
+        """
+        self.store(state.getHash(), estimateScore, bestMove or NO_MOVE, FLAG_CODES[flag], shearchDepth)
+
+    def isInTable(self, state: SearchState) -> bool:
+        return self.probe(state.getHash())[0] >= 0
+
+    def getEntry(self, state: SearchState) -> Optional[Tuple[float, Optional[int], str, int, None]]:
+        """
+        Retrieves an entry from the table.
+
+        Args:
+            state: The search state to retrieve the entry for.
+
+        Returns:
+            (estimateScore, bestMove, flag, shearchDepth, previousBestMove) comme TranspositionTable.getEntry,
+            previousBestMove valant toujours None, ou None si la position n'est pas dans la table.
+        """
+        index, data = self.probe(state.getHash())
+        if index < 0:
+            return None
+        score, move, depth, flagCode, age = unpackEntry(data)
+        if age != self.age:
+            self.nbReused += 1
+        return score, move or None, FLAGS[flagCode], depth, None
+
+    def releaseViews(self) -> None:
+        # Le bloc (ou le fichier) ne peut pas être fermé tant que des vues sur lui existent
+        self.entries.release()
+        if self.mappedFile is not None:
+            self.buffer.release()
+
+    def close(self) -> None:
+        """
+        Ferme la table dans ce processus. Un bloc shared_memory est détruit si la table l'a créé, un fichier est
+        conservé. La table n'est plus utilisable.
+        """
+        self.releaseViews()
+        if self.mappedFile is not None:
+            self.mappedFile.close()
+        else:
+            self.sharedMemory.close()
+            if self.isOwner:
+                self.sharedMemory.unlink()
+
+    def __del__(self):
+        if getattr(self, 'entries', None) is not None:
+            self.releaseViews()
+
+    def to_json(self) -> dict:
+        return {}
@@ -0,0 +1,163 @@
+import time
+from typing import List, Optional
+
+# Part du temps donnée à un coup selon l'avancement de la partie : l'ouverture est jouée plus vite, le milieu de
+# partie, où se décident les premières éjections, reçoit le plus de temps
+OPENING_STEPS = 8
+ENDGAME_STEPS = 10
+OPENING_WEIGHT = 0.5
+MIDDLEGAME_WEIGHT = 1.2
+ENDGAME_WEIGHT = 0.8
+
+# Limite dure : multiple du temps prévu pour le coup, et part maximale du temps restant
+HARD_FACTOR = 3.0
+MAX_REMAINING_FRACTION = 0.25
+
+# Ajustements de la limite souple après chaque itération
+UNSTABLE_FACTOR = 1.6
+SCORE_DROP = 30
+SCORE_DROP_FACTOR = 1.4
+STABLE_ITERATIONS = 3
+STABLE_FACTOR = 0.6
+
+# Rapport de durée entre deux itérations successives, utilisé tant qu'il n'a pas pu être mesuré
+DEFAULT_BRANCHING = 4.0
+MIN_BRANCHING = 1.5
+MAX_BRANCHING = 12.0
+# Les itérations plus courtes ne donnent pas une mesure fiable du rapport
+MIN_MEASURED_TIME = 0.002
+
+
+class TimeManager:
+    """
+        Répartition du temps de réflexion entre les coups de la partie et entre les itérations d'une recherche.
+
+        Au lieu de diviser le temps restant également entre les coups restants et d'interrompre la recherche en pleine
+        itération quand ce temps est écoulé, chaque coup reçoit deux limites (startMove) :
+            - une limite souple, proportionnelle au poids de la phase de jeu (voir phaseWeight) : aucune nouvelle
+              itération n'est commencée après elle
+            - une limite dure, plusieurs fois plus grande : la recherche est interrompue si elle l'atteint
+
+        Après chaque itération (onIterationFinished), la limite souple est ajustée : allongée si le meilleur coup vient
+        de changer ou si le score chute, raccourcie si le meilleur coup est stable depuis plusieurs itérations. Enfin,
+        une itération n'est pas commencée si sa durée prévue (durée de la précédente multipliée par le rapport mesuré
+        entre deux itérations successives) dépasse la limite dure : le temps qu'elle aurait pris serait perdu.
+
+        Args:
+            maxStep: nombre de tours de la partie
+            overhead: temps réservé à chaque coup pour la communication avec le serveur (s)
+
+        Attributes:
+            startTime: début de la réflexion pour le coup actuel
+            baseTime: temps prévu pour le coup actuel (s)
+            softLimit: limite souple actuelle (s depuis startTime)
+            hardLimit: limite dure (s depuis startTime)
+            iterationTimes: durée de chaque itération terminée pour le coup actuel
+    """
+
+    def __init__(self, maxStep: int = 50, overhead: float = 0.1):
+        self.maxStep = maxStep
+        self.overhead = overhead
+        self.startTime = 0.
+        self.baseTime = 0.
+        self.softLimit = 0.
+        self.hardLimit = 0.
+        self.iterationTimes: List[float] = []
+        self.lastIterationEnd = 0.
+        self.previousMove: Optional[int] = None
+        self.previousEval: Optional[float] = None
+        self.nbStableIterations = 0
+
+    def phaseWeight(self, step: int) -> float:
+        """
+        Poids d'un coup dans la répartition du temps selon l'avancement de la partie
+        """
+        if step < OPENING_STEPS:
+            return OPENING_WEIGHT
+        if step >= self.maxStep - ENDGAME_STEPS:
+            return ENDGAME_WEIGHT
+        return MIDDLEGAME_WEIGHT
+
+    def startMove(self, remainingTime: float, step: int) -> None:
+        """
+        Calcule les limites du coup à jouer et démarre le chronomètre
+
+        Args:
+            remainingTime: temps restant au joueur pour la partie (s)
+            step: tour actuel
+        """
+        self.startTime = time.time()
+        available = max(0., remainingTime - self.overhead)
+        # Le temps restant est partagé entre nos coups restants (un tour sur deux) selon leur poids
+        weights = [self.phaseWeight(s) for s in range(step, max(self.maxStep, step + 1), 2)]
+        self.baseTime = available * self.phaseWeight(step) / sum(weights)
+        self.hardLimit = min(self.baseTime * HARD_FACTOR, available * MAX_REMAINING_FRACTION)
+        self.hardLimit = max(self.hardLimit, self.baseTime)
+        self.softLimit = self.baseTime
+
+        self.iterationTimes = []
+        self.lastIterationEnd = self.startTime
+        self.previousMove = None
+        self.previousEval = None
+        self.nbStableIterations = 0
+
+    def getElapsed(self) -> float:
+        return time.time() - self.startTime
+
+    def getSoftLimit(self) -> float:
+        return self.softLimit
+
+    def getHardLimit(self) -> float:
+        return self.hardLimit
+
+    def predictIterationTime(self) -> Optional[float]:
+        """
+        Durée prévue de la prochaine itération, None si aucune itération n'est terminée
+        """
+        if not self.iterationTimes:
+            return None
+        last = self.iterationTimes[-1]
+        branching = DEFAULT_BRANCHING
+        if len(self.iterationTimes) >= 2 and self.iterationTimes[-2] >= MIN_MEASURED_TIME:
+            branching = min(max(last / self.iterationTimes[-2], MIN_BRANCHING), MAX_BRANCHING)
+        return last * branching
+
+    def onIterationFinished(self, evaluation: float, move: Optional[int]) -> None:
+        """
+        Enregistre la durée d'une itération terminée et ajuste la limite souple
+
+        Args:
+            evaluation: évaluation de la racine à la fin de l'itération
+            move: meilleur coup de l'itération
+        """
+        now = time.time()
+        self.iterationTimes.append(now - self.lastIterationEnd)
+        self.lastIterationEnd = now
+
+        factor = 1.
+        if self.previousMove is not None and move != self.previousMove:
+            # Le meilleur coup change : la recherche n'a pas encore tranché
+            factor *= UNSTABLE_FACTOR
+            self.nbStableIterations = 0
+        elif self.previousMove is not None:
+            self.nbStableIterations += 1
+        if self.previousEval is not None and evaluation < self.previousEval - SCORE_DROP:
+            # Le score chute : on cherche une meilleure défense
+            factor *= SCORE_DROP_FACTOR
+        elif self.nbStableIterations >= STABLE_ITERATIONS:
+            factor *= STABLE_FACTOR
+        self.softLimit = min(self.baseTime * factor, self.hardLimit)
+
+        self.previousMove = move
+        self.previousEval = evaluation
+
+    def shouldStartIteration(self) -> bool:
+        """
+        Indique si une nouvelle itération peut être commencée : la limite souple n'est pas atteinte et l'itération
+        devrait se terminer avant la limite dure
+        """
+        elapsed = self.getElapsed()
+        if elapsed >= self.softLimit:
+            return False
+        predicted = self.predictIterationTime()
+        return predicted is None or elapsed + predicted <= self.hardLimit
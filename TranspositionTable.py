@@ -2,6 +2,7 @@ import random
 import copy
 from typing import Tuple
 
+from SearchState import SearchState
 from game_state_abalone import GameStateAbalone
 from seahorse.game.action import Action
 from weakref import WeakValueDictionary
@@ -93,6 +94,10 @@ class TranspositionTable:
         Returns:
 
         """
+        # Un SearchState maintient son hash à chaque coup joué, inutile de parcourir le plateau
+        if isinstance(state, SearchState):
+            return state.getHash()
+
         h = 0
         couleurJoueur = state.get_next_player().get_piece_type()
         indexJoueur = 0 if couleurJoueur == 'W' else 1
@@ -1,5 +1,9 @@
 import hashlib
 
+from ArrayTranspositionTable import ArrayTranspositionTable
+from EvaluationCache import EvaluationCache
+from SearchControl import SearchControl
+from SearchState import SearchState, DRAW
 from TranspositionTable import TranspositionTable
 from game_state_abalone import GameStateAbalone
 from player_abalone import PlayerAbalone
@@ -870,3 +874,165 @@ def alphabeta_search_IterativeDeepening(
         }
 
     return currentBestEval, currentBestAction, metrics
+
+
+def alphabeta_search_MakeUnmake(
+        state: GameStateAbalone,
+        remainingTime,
+        heuristiqueFct=heuristique.positionHeuristiqueV2Bitboard,
+        cutoff_depth=3,
+        transpoTable: ArrayTranspositionTable = None,
+        evaluationCache: EvaluationCache = None
+        ) \
+        -> (float, int, dict):
+    """
+    Alpha-beta search with a time limit, walking the tree with make/unmake on a single SearchState.
+
+    Contrairement aux autres versions, on ne construit pas d'état (GameStateAbalone + BoardAbalone + scores) pour
+    chaque action : les coups (encodés en entiers, voir move.py) sont appliqués puis annulés sur un unique
+    SearchState. Le coup retourné doit être converti en Action avec move.moveToAction.
+
+    Args:
+        state: Current game state.
+        remainingTime: temps restant
+        heuristiqueFct: Heuristic function, evaluating a SearchState.
+        cutoff_depth: Maximum search depth.
+        transpoTable: table de transposition optionnelle (les entrées sont indexées par le hash du SearchState)
+        evaluationCache: cache optionnel des évaluations des feuilles, propre à heuristiqueFct
+
+    Returns:
+        Tuple containing the best evaluation, the best move, and metrics.
+    """
+
+    nbActionSearched = 0
+    nbPruning = 0
+    nbTransposition = 0
+    if state.get_step() % 2 == 0:
+        remainingMove = (50 - state.get_step()) // 2
+    else:
+        remainingMove = (51 - state.get_step()) // 2
+    print('Remaining move :', remainingMove)
+
+    start_time = time.time()
+    max_time_per_move = remainingTime / remainingMove  # 15 minutes / 25 moves = 18 seconds per move
+    print('Max time :', max_time_per_move)
+
+    stopRecherche = False
+    # L'horloge n'est lue que tous les quelques centaines de noeuds
+    control = SearchControl()
+    control.start(max_time_per_move)
+
+    def isRechercheOver():
+        return control.isOver()
+
+    def recherche(currentState: SearchState, alpha, beta, depth):
+        nonlocal nbActionSearched
+        nonlocal stopRecherche
+        nonlocal nbTransposition
+        nbActionSearched += 1
+
+        if isRechercheOver():
+            print("Fin de la recherche, temps écoulé")
+            stopRecherche = True
+            return 0, None
+
+        if currentState.isDone():
+            winner = currentState.getWinner()
+            if winner == DRAW:
+                return 0, None
+            elif winner == currentState.getSide():
+                return winScore, None
+            else:
+                return -winScore, None
+
+        if depth > cutoff_depth:
+            if evaluationCache is None:
+                return heuristiqueFct(currentState), None
+            evaluation = evaluationCache.get(currentState.getHash())
+            if evaluation is None:
+                evaluation = heuristiqueFct(currentState)
+                evaluationCache.store(currentState.getHash(), evaluation)
+            return evaluation, None
+
+        # Profondeur restant à chercher sous ce noeud, c'est elle qui est stockée dans la table
+        remainingDepth = cutoff_depth + 1 - depth
+
+        TtBestMove = None
+        if transpoTable is not None:
+            entry = transpoTable.getEntry(currentState)
+            if entry is not None:
+                TtEstimateScore, TtBestMove, TtFlag, TtShearchDepth, _ = entry
+                # A la racine on a besoin d'un coup, on ne s'arrête donc pas sur l'entrée de la table
+                if depth > 0 and TtShearchDepth >= remainingDepth:
+                    if TtFlag == 'exact' \
+                            or (TtFlag == 'lowerbound' and TtEstimateScore >= beta) \
+                            or (TtFlag == 'upperbound' and TtEstimateScore <= alpha):
+                        nbTransposition += 1
+                        return TtEstimateScore, TtBestMove
+
+        bestEval = -infinity
+        bestMove = None
+        alphaOrigin = alpha
+
+        # Création et ordonnance de la liste des coups possibles
+        listeMoves = currentState.generateMoves()
+        listeMoves.sort(key=utils.getMoveOrderScore, reverse=True)
+        # Si on a un best move de la TT, on l'étudie en premier
+        if TtBestMove in listeMoves:
+            listeMoves.remove(TtBestMove)
+            listeMoves.insert(0, TtBestMove)
+
+        for move in listeMoves:
+            token = currentState.makeMove(move)
+            evaluation, _ = recherche(currentState, -beta, -alpha, depth + 1)
+            evaluation = -evaluation
+            currentState.unmakeMove(token)
+
+            # La recherche est stoppé, alors on ne sauvegarde pas ce résultat et on sort
+            if stopRecherche:
+                break
+
+            if evaluation > bestEval:
+                bestEval = evaluation
+                bestMove = move
+                alpha = max(alpha, evaluation)
+
+            if bestEval >= beta:
+                nonlocal nbPruning
+                nbPruning += 1
+                break
+
+        # On ajoute l'entrée dans la table de transposition (sauf si la recherche a été interrompue)
+        if transpoTable is not None and not stopRecherche:
+            if bestEval >= beta:
+                flag = 'lowerbound'
+            elif bestEval <= alphaOrigin:
+                flag = 'upperbound'
+            else:
+                flag = 'exact'
+            transpoTable.addEntry(currentState, bestEval, bestMove, flag, remainingDepth)
+
+        return bestEval, bestMove
+
+    if transpoTable is not None:
+        transpoTable.resetCounters()
+    if evaluationCache is not None:
+        evaluationCache.resetCounters()
+    searchState = SearchState.fromGameState(state)
+    bestEval, bestMove = recherche(searchState, -infinity, infinity, 0)
+
+    metrics = {
+        "Number of states evaluated": nbActionSearched,
+        "Number of prunings": nbPruning,
+        "Elapsed time (s)": round(time.time() - start_time, 2)
+        }
+    if transpoTable is not None:
+        metrics["Number of transpostion"] = nbTransposition
+        metrics["Number of overwrites"] = transpoTable.getNbOverwrites()
+        metrics["Taille de la table"] = transpoTable.getLenTable()
+        metrics["Entrées réutilisées"] = transpoTable.getNbReused()
+    if evaluationCache is not None:
+        metrics["Evaluation cache hits"] = evaluationCache.getNbHits()
+        metrics["Evaluation cache misses"] = evaluationCache.getNbMisses()
+
+    return bestEval, bestMove, metrics
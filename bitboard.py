@@ -0,0 +1,233 @@
+"""
+Représentation compacte du plateau sous forme de bitboards.
+
+Les 61 cases jouables de la grille 17x9 (coordonnées doublées) de BoardAbalone sont numérotées de 0 à 60, ligne par
+ligne. Un plateau est alors représenté par un entier par couleur, dont le bit k vaut 1 si une bille de cette couleur
+occupe la case k. Cela permet à la recherche de manipuler des entiers plutôt que des dictionnaires de Piece.
+"""
+import random
+from typing import Dict, Iterator, List, Tuple
+
+from seahorse.game.game_layout.board import Piece
+from seahorse.player.player import Player
+
+# Dimensions de la grille utilisée par BoardAbalone
+DIMENSIONS = (17, 9)
+# Centre du plateau dans la grille
+CENTRE = (DIMENSIONS[0] // 2, DIMENSIONS[1] // 2)
+# Rayon du plateau hexagonal (nombre de cases entre le centre et le bord)
+RADIUS = 4
+
+# Index des couleurs dans les listes de masques
+WHITE = 0
+BLACK = 1
+PIECE_TYPES = ('W', 'B')
+
+
+def hexDistance(i: int, j: int) -> int:
+    """
+    Distance (en nombre de cases) entre la case (i, j) de la grille et le centre du plateau.
+    On passe par les coordonnées axiales (q, r) de l'hexagone pour avoir une distance exacte.
+
+    Args:
+        i: indice de la ligne
+        j: indice de la colonne
+
+    Returns:
+        int: distance au centre
+    """
+    q = j - CENTRE[1]
+    r = (i - CENTRE[0] - q) // 2
+    return (abs(q) + abs(r) + abs(q + r)) // 2
+
+
+def _isCell(i: int, j: int) -> bool:
+    return (i - j) % 2 == 0 and hexDistance(i, j) <= RADIUS
+
+
+# Liste des coordonnées des cases jouables, l'index d'une case dans cette liste est son bit dans les masques
+CELLS: List[Tuple[int, int]] = [(i, j) for i in range(DIMENSIONS[0]) for j in range(DIMENSIONS[1]) if _isCell(i, j)]
+NB_CELLS = len(CELLS)
+CELL_INDEX: Dict[Tuple[int, int], int] = {coord: index for index, coord in enumerate(CELLS)}
+FULL_MASK = (1 << NB_CELLS) - 1
+# Distance au centre de chaque case (entre 0 et RADIUS), par index et par coordonnées : remplace les appels à
+# utils.manhattanDist(centre, coord) dans les évaluations
+CENTRE_DISTANCE: List[int] = [hexDistance(i, j) for i, j in CELLS]
+CENTRE_DISTANCE_BY_COORD: Dict[Tuple[int, int], int] = dict(zip(CELLS, CENTRE_DISTANCE))
+# Cases du bord du plateau : une bille qui y est poussée peut être éjectée au coup suivant
+EDGE_MASK = sum(1 << index for index, distance in enumerate(CENTRE_DISTANCE) if distance == RADIUS)
+
+# Déplacements dans la grille pour les 6 directions, rangés de sorte que la direction opposée à d soit (d + 3) % 6
+DIRECTIONS: List[Tuple[int, int]] = [(-1, -1), (-2, 0), (-1, 1), (1, 1), (2, 0), (1, -1)]
+NB_DIRECTIONS = len(DIRECTIONS)
+# Noms des directions utilisés par BoardAbalone.get_neighbours
+DIRECTION_NAMES = ("top_left", "top_right", "right", "bottom_right", "bottom_left", "left")
+# Case hors du plateau
+OFF_BOARD = -1
+# Longueur maximale utile d'un rayon : 3 billes alliées + 2 billes adverses poussées, la dernière case étant celle où
+# arrive la bille adverse de tête
+RAY_LENGTH = 5
+
+
+def _buildNeighbours() -> List[Tuple[int, ...]]:
+    neighbours = []
+    for i, j in CELLS:
+        neighbours.append(tuple(CELL_INDEX.get((i + di, j + dj), OFF_BOARD) for di, dj in DIRECTIONS))
+    return neighbours
+
+
+def _buildRays() -> List[Tuple[Tuple[int, ...], ...]]:
+    rays = []
+    for cell in range(NB_CELLS):
+        cellRays = []
+        for direction in range(NB_DIRECTIONS):
+            ray = []
+            current = NEIGHBOURS[cell][direction]
+            while current != OFF_BOARD and len(ray) < RAY_LENGTH:
+                ray.append(current)
+                current = NEIGHBOURS[current][direction]
+            cellRays.append(tuple(ray))
+        rays.append(tuple(cellRays))
+    return rays
+
+
+# Tables précalculées une seule fois à l'import, pour ne plus faire de calcul de coordonnées ni de test de masque
+# dans les boucles de la recherche :
+# NEIGHBOURS[case][direction] : case voisine (OFF_BOARD si en dehors du plateau)
+NEIGHBOURS: List[Tuple[int, ...]] = _buildNeighbours()
+# RAYS[case][direction] : cases rencontrées en partant de la case dans la direction (au plus RAY_LENGTH), la case de
+# départ exclue. Si le rayon est plus court que RAY_LENGTH, la case suivant la dernière est hors du plateau
+RAYS: List[Tuple[Tuple[int, ...], ...]] = _buildRays()
+# NEIGHBOUR_MASKS[case] : masque des cases voisines
+NEIGHBOUR_MASKS: List[int] = [sum(1 << n for n in cellNeighbours if n != OFF_BOARD) for cellNeighbours in NEIGHBOURS]
+
+# Directions canoniques des lignes de billes : une ligne orientée selon d l'est aussi selon (d + 3) % 6, on ne garde
+# que l'une des deux pour que chaque groupe n'apparaisse qu'une fois
+LINE_DIRECTIONS = (3, 4, 5)
+
+
+def _buildGroups() -> List[Tuple[Tuple[int, int, int, Tuple[Tuple[int, int], ...]], ...]]:
+    groups = []
+    for anchor in range(NB_CELLS):
+        anchorGroups = []
+        for lineIndex, lineDirection in enumerate(LINE_DIRECTIONS):
+            line = (anchor,) + RAYS[anchor][lineDirection][:2]
+            for size in (2, 3):
+                if len(line) < size:
+                    continue
+                groupCells = line[:size]
+                targets = []
+                # Un déplacement latéral se fait dans l'une des 4 directions qui ne sont pas celles de la ligne
+                for direction in range(NB_DIRECTIONS):
+                    if direction % 3 == lineDirection % 3:
+                        continue
+                    destinations = [NEIGHBOURS[cell][direction] for cell in groupCells]
+                    # Un déplacement latéral ne peut pas sortir une bille du plateau
+                    if OFF_BOARD in destinations:
+                        continue
+                    targets.append((direction, sum(1 << cell for cell in destinations)))
+                anchorGroups.append((sum(1 << cell for cell in groupCells), lineIndex, size, tuple(targets)))
+        groups.append(tuple(anchorGroups))
+    return groups
+
+
+# GROUPS[ancre] : groupes de 2 ou 3 cases alignées partant de la case ancre dans une direction de LINE_DIRECTIONS, sous
+# la forme (masque du groupe, index de la direction dans LINE_DIRECTIONS, taille, ((direction, masque des cases
+# d'arrivée), ...)). Un déplacement latéral est légal si le groupe est occupé par nos billes et que le masque d'arrivée
+# est vide.
+GROUPS: List[Tuple[Tuple[int, int, int, Tuple[Tuple[int, int], ...]], ...]] = _buildGroups()
+
+
+# Clés de Zobrist : une valeur aléatoire de 64 bits par case et par couleur, plus une pour le joueur qui doit jouer.
+# Le générateur a sa propre graine pour que les clés soient les mêmes d'une exécution (et d'un processus) à l'autre
+_zobristRandom = random.Random(999)
+ZOBRIST_KEYS: List[List[int]] = [[_zobristRandom.getrandbits(64) for _ in range(NB_CELLS)] for _ in PIECE_TYPES]
+ZOBRIST_SIDE: int = _zobristRandom.getrandbits(64)
+# Près de la fin de partie (maxStep), la valeur d'une position dépend aussi du nombre de tours restants : une clé par
+# nombre de tours restants, utilisée seulement quand il en reste au plus STEP_HORIZON (profondeur maximale de
+# recherche et prolongation de quiescence comprises)
+STEP_HORIZON = 24
+ZOBRIST_STEPS_LEFT: List[int] = [_zobristRandom.getrandbits(64) for _ in range(STEP_HORIZON + 1)]
+
+
+def stepKey(stepsLeft: int) -> int:
+    """
+    Clé de Zobrist du nombre de tours restants, 0 si la fin de partie est au-delà de STEP_HORIZON
+    """
+    return ZOBRIST_STEPS_LEFT[stepsLeft] if 0 <= stepsLeft <= STEP_HORIZON else 0
+
+
+def zobristHash(masks: List[int], side: int) -> int:
+    """
+    Calcul complet du hash de Zobrist d'une position. La recherche n'utilise cette fonction qu'à la création de
+    l'état, le hash étant ensuite mis à jour à chaque coup.
+
+    Args:
+        masks: masques des billes [blanches, noires]
+        side: couleur du joueur qui doit jouer
+
+    Returns:
+        int: hash de la position
+    """
+    h = ZOBRIST_SIDE if side == BLACK else 0
+    for colour, mask in enumerate(masks):
+        for cell in iterCells(mask):
+            h ^= ZOBRIST_KEYS[colour][cell]
+    return h
+
+
+def colourIndex(pieceType: str) -> int:
+    """
+    Index de la couleur associée à un type de pièce ('W' ou 'B')
+    """
+    return WHITE if pieceType == 'W' else BLACK
+
+
+def iterCells(mask: int) -> Iterator[int]:
+    """
+    Parcourt les index des cases occupées d'un masque, du bit de poids faible au bit de poids fort
+
+    Args:
+        mask: masque à parcourir
+
+    Returns:
+        Iterator[int]: index des cases dont le bit vaut 1
+    """
+    while mask:
+        lowBit = mask & -mask
+        yield lowBit.bit_length() - 1
+        mask ^= lowBit
+
+
+def envToBitboards(env: Dict[Tuple[int, int], Piece]) -> List[int]:
+    """
+    Convertit l'environnement d'un BoardAbalone en bitboards
+
+    Args:
+        env: dictionnaire coordonnées -> pièce de BoardAbalone
+
+    Returns:
+        List[int]: masques des billes blanches et noires ([WHITE, BLACK])
+    """
+    masks = [0, 0]
+    for coord, piece in env.items():
+        masks[colourIndex(piece.get_type())] |= 1 << CELL_INDEX[coord]
+    return masks
+
+
+def bitboardsToEnv(masks: List[int], players: List[Player]) -> Dict[Tuple[int, int], Piece]:
+    """
+    Reconstruit l'environnement d'un BoardAbalone à partir des bitboards
+
+    Args:
+        masks: masques des billes blanches et noires ([WHITE, BLACK])
+        players: joueurs propriétaires des billes, indexés par couleur
+
+    Returns:
+        Dict[Tuple[int, int], Piece]: dictionnaire coordonnées -> pièce
+    """
+    env = {}
+    for colour, mask in enumerate(masks):
+        for index in iterCells(mask):
+            env[CELLS[index]] = Piece(piece_type=PIECE_TYPES[colour], owner=players[colour])
+    return env
@@ -6,6 +6,8 @@ from typing import Dict
 from seahorse.game.game_layout.board import Board, Piece
 from seahorse.utils.serializer import Serializable
 
+import bitboard
+
 
 class BoardAbalone(Board):
     """
@@ -77,19 +79,23 @@ class BoardAbalone(Board):
         Returns:
             Dict[str,Tuple[str,Tuple[int,int]]]: dictionnary of the neighbours of the cell (i,j)
         """
-        neighbours = {"top_left": (i - 1, j - 1), "top_right": (i - 2, j), "left": (i + 1, j - 1),
-                      "right": (i - 1, j + 1), "bottom_left": (i + 2, j), "bottom_right": (i + 1, j + 1)}
-        for k, v in neighbours.items():
-            if v not in self.env.keys():
-                if v[0] < 0 or v[1] < 0 or v[0] >= self.dimensions[0] or v[1] >= self.dimensions[1]:
-                    neighbours[k] = ("OUTSIDE", neighbours[k])
-                else:
-                    if BoardAbalone.FORBIDDEN_MASK[v[0]][v[1]]:
-                        neighbours[k] = ("OUTSIDE", neighbours[k])
-                    else:
-                        neighbours[k] = ("EMPTY", neighbours[k])
+        env = self.env
+        cell = bitboard.CELL_INDEX.get((i, j))
+        neighbours = {}
+        for direction, name in enumerate(bitboard.DIRECTION_NAMES):
+            di, dj = bitboard.DIRECTIONS[direction]
+            coord = (i + di, j + dj)
+            # Les voisins des cases du plateau sont précalculés, inutile de tester les bornes et FORBIDDEN_MASK
+            if cell is not None:
+                inside = bitboard.NEIGHBOURS[cell][direction] != bitboard.OFF_BOARD
+            else:
+                inside = coord in bitboard.CELL_INDEX
+            if not inside:
+                neighbours[name] = ("OUTSIDE", coord)
+            elif coord in env:
+                neighbours[name] = (env[coord].get_type(), coord)
             else:
-                neighbours[k] = (self.env[neighbours[k]].get_type(), neighbours[k])
+                neighbours[name] = ("EMPTY", coord)
         return neighbours
 
     def get_grid(self) -> List[List[int]]:
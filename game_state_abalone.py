@@ -133,9 +133,22 @@ class GameStateAbalone(GameState):
             p = b.get((i, j), None)
             if p.get_owner_id() == self.next_player.get_id():
                 list_index = [(-1, -1), (1, -1), (-1, 1), (1, 1), (2, 0), (-2, 0)]
+                # Every move pushing one of our own pieces off the board from (i, j) leads to the same board: only the
+                # first one is generated
+                suicide = False
                 for n_i, n_j in list_index:
                     to_move_pieces = self.detect_conflict(i, j, n_i, n_j)
                     if to_move_pieces is not None:
+                        last_i, last_j = to_move_pieces[-1]
+                        on_board = (
+                            0 <= last_i + n_i < d[0]
+                            and 0 <= last_j + n_j < d[1]
+                            and self.in_hexa((last_i + n_i, last_j + n_j))
+                        )
+                        if not on_board and b[(last_i, last_j)].get_owner_id() == self.next_player.get_id():
+                            if suicide:
+                                continue
+                            suicide = True
                         copy_b = copy.copy(b)
                         id_add = None
                         pop_piece = None
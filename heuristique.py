@@ -3,12 +3,42 @@ from seahorse.game.action import Action
 from game_state_abalone import GameStateAbalone
 from seahorse.game.game_state import GameState
 from seahorse.utils.custom_exceptions import MethodNotImplementedError
+from SearchState import SearchState
 
+import bitboard
 import utils
 import math
 import random
 
 
+# Tables de correspondance distance au centre / score des heuristiques
+DIST_SCORE_PLAYER = [4, 4, 3, -1, -3]
+DIST_SCORE_ADVERSAIRE = [-3, -3, -1, 2, 5]
+DIST_SCORE_V2 = [7, 7, 2, -1, -5]
+
+
+def _positionScores(distScore):
+    """
+    Score de chaque case du plateau pour une table distance/score, indexé par coordonnées
+    """
+    return {coord: distScore[distance] for coord, distance in bitboard.CENTRE_DISTANCE_BY_COORD.items()}
+
+
+# Score de position de chaque case, calculé une seule fois à l'import : les heuristiques n'ont plus à calculer la
+# distance au centre de chaque bille
+POSITION_SCORE_PLAYER = _positionScores(DIST_SCORE_PLAYER)
+POSITION_SCORE_ADVERSAIRE = _positionScores(DIST_SCORE_ADVERSAIRE)
+POSITION_SCORE_V2 = _positionScores(DIST_SCORE_V2)
+# Même table indexée par case des bitboards (voir bitboard.CELLS)
+POSITION_SCORE_V2_CELLS = [DIST_SCORE_V2[distance] for distance in bitboard.CENTRE_DISTANCE]
+
+# Écart maximal que les termes de position (cases et billes isolées) de positionHeuristiqueV2 peuvent ajouter au
+# matériel : 14 billes sur les meilleures cases contre 14 billes isolées sur les pires
+NB_MARBLES = 14
+POSITIONAL_SWING_V2 = (sum(sorted(POSITION_SCORE_V2_CELLS, reverse=True)[:NB_MARBLES])
+                       - NB_MARBLES * (min(POSITION_SCORE_V2_CELLS) - 5))
+
+
 def nullHeuristique(state: GameStateAbalone):
     return 0
 
@@ -86,28 +116,21 @@ def positionHeuristique(state: GameStateAbalone):
 
     """
 
-    # Table de correspondance distance/score pour le joueur
-    distScorePlayer = [4, 4, 3, -1, -3]
-    # Table de correspondance distance/score pour l'adversaire
-    distScoreAdversaire = [-3, -3, -1, 2, 5]
+    # Score de chaque case pour le joueur et pour l'adversaire (tables DIST_SCORE_PLAYER et DIST_SCORE_ADVERSAIRE)
+    positionScorePlayer = POSITION_SCORE_PLAYER
+    positionScoreAdversaire = POSITION_SCORE_ADVERSAIRE
 
     playerId = state.get_next_player().get_id()
     # print("Id du joueur :", playerId)
 
     scoreTot = 0
 
-    dim = state.get_rep().get_dimensions()
-    centre = (dim[0] // 2, dim[1] // 2)
-    # print("Centre : ",centre)
-
     # Calcul du score pour la position des pièces
     for coord, piece in state.get_rep().env.items():
-        distance = int(utils.manhattanDist(centre, coord))
-        # print(coord, piece.__dict__, distance)
         if piece.get_owner_id() == playerId:
-            scoreTot += distScorePlayer[distance]
+            scoreTot += positionScorePlayer[coord]
         else:
-            scoreTot += distScoreAdversaire[distance]
+            scoreTot += positionScoreAdversaire[coord]
 
     # Ajout du score avec un facteur choisi, après des tests la valeur de 100 semble bien
     facteurScore = 50
@@ -165,10 +188,9 @@ def lonelyHeuristique(state: GameStateAbalone):
         float: évaluation de la position pour le joeur qui doit jouer
     """
 
-    # Table de correspondance distance/score pour le joueur
-    distScorePlayer = [4, 4, 3, -1, -3]
-    # Table de correspondance distance/score pour l'adversaire
-    distScoreAdversaire = [-3, -3, -1, 2, 5]
+    # Score de chaque case pour le joueur et pour l'adversaire (tables DIST_SCORE_PLAYER et DIST_SCORE_ADVERSAIRE)
+    positionScorePlayer = POSITION_SCORE_PLAYER
+    positionScoreAdversaire = POSITION_SCORE_ADVERSAIRE
 
     scoreLonely = 10
 
@@ -177,20 +199,15 @@ def lonelyHeuristique(state: GameStateAbalone):
 
     scoreTot = 0
 
-    dim = state.get_rep().get_dimensions()
-    centre = (dim[0] // 2, dim[1] // 2)
-
     # Calcul du score pour la position des pièces
     for coord, piece in state.get_rep().env.items():
-        distance = int(utils.manhattanDist(centre, coord))
-        # print(coord, piece.__dict__, distance)
         isLonely = utils.isLonely(state, coord, piece.get_type())
         if piece.get_owner_id() == playerId:
-            scoreTot += distScorePlayer[distance]
+            scoreTot += positionScorePlayer[coord]
             if isLonely :
                 scoreTot -= scoreLonely
         else:
-            scoreTot += distScoreAdversaire[distance]
+            scoreTot += positionScoreAdversaire[coord]
             if isLonely :
                 scoreTot += scoreLonely
 
@@ -235,8 +252,8 @@ def positionHeuristiqueV2(state: GameStateAbalone):
         float: évaluation de la position pour le joueur qui doit jouer
     """
 
-    # Table de correspondance distance/score
-    distScore = [7, 7, 2, -1, -5]
+    # Score de chaque case (table de correspondance distance/score DIST_SCORE_V2)
+    positionScore = POSITION_SCORE_V2
 
     # Score pour chaque pièce (pour pénaliser la perte de pièce)
     scorePiece = 100
@@ -248,24 +265,18 @@ def positionHeuristiqueV2(state: GameStateAbalone):
     scoreJoueur = 0
     scoreAdversaire = 0
 
-    # Calcul des coordonnées du centre du plateau
-    dim = state.get_rep().get_dimensions()
-    centre = (dim[0] // 2, dim[1] // 2)
-
     # Calcul du score pour la position des pièces
     for coord, piece in state.get_rep().env.items():
-        # Calcul de la distance de la pièce au centre (entre 0 et 4)
-        distance = int(utils.manhattanDist(centre, coord))
         # Determine si la pièce est isolé
         isLonely = utils.isLonely(state, coord, piece.get_type())
 
         # Ajout du score en fonction de la distance et du fait que la pièce soit isolé ou non
         if piece.get_owner_id() == playerId:
-            scoreJoueur += distScore[distance]
+            scoreJoueur += positionScore[coord]
             if isLonely:
                 scoreJoueur -= scoreLonely
         else:
-            scoreAdversaire += distScore[distance]
+            scoreAdversaire += positionScore[coord]
             if isLonely:
                 scoreAdversaire -= scoreLonely
 
@@ -277,3 +288,74 @@ def positionHeuristiqueV2(state: GameStateAbalone):
             scoreAdversaire += scorePiece * state.get_player_score(p)
 
     return scoreJoueur-scoreAdversaire
+
+
+def positionHeuristiqueV2Bitboard(state: SearchState):
+    """
+    Même évaluation que positionHeuristiqueV2 mais calculée sur un SearchState (bitboards) au lieu d'un
+    GameStateAbalone, pour être utilisée par les recherches en make/unmake.
+
+    Args:
+        state: état de recherche à évaluer
+
+    Returns:
+        float: évaluation de la position pour le joueur qui doit jouer
+    """
+
+    # Score de chaque case (table de correspondance distance/score DIST_SCORE_V2)
+    positionScore = POSITION_SCORE_V2_CELLS
+
+    # Score pour chaque pièce (pour pénaliser la perte de pièce)
+    scorePiece = 100
+    # Score pour chaque pièce isolé (pour pénaliser les pièces isolé)
+    scoreLonely = 5
+
+    scores = [0, 0]
+    for colour, mask in enumerate(state.masks):
+        for cell in bitboard.iterCells(mask):
+            # Ajout du score en fonction de la distance au centre
+            scores[colour] += positionScore[cell]
+            # Pénalité si aucune des cases voisines ne contient une bille alliée
+            if not mask & bitboard.NEIGHBOUR_MASKS[cell]:
+                scores[colour] -= scoreLonely
+        # Ajout des pénalités pour les pièces perdues
+        scores[colour] -= scorePiece * state.lost[colour]
+
+    return scores[state.side] - scores[1 - state.side]
+
+
+def materialHeuristiqueV2(state: SearchState):
+    """
+    Terme matériel seul de positionHeuristiqueV2Bitboard. L'évaluation complète est comprise entre
+    materialHeuristiqueV2(state) - POSITIONAL_SWING_V2 et materialHeuristiqueV2(state) + POSITIONAL_SWING_V2.
+
+    Args:
+        state: état de recherche à évaluer
+
+    Returns:
+        float: matériel de la position pour le joueur qui doit jouer
+    """
+    # Score pour chaque pièce (pour pénaliser la perte de pièce)
+    scorePiece = 100
+    return scorePiece * (state.lost[1 - state.side] - state.lost[state.side])
+
+
+def positionHeuristiqueV2Incremental(state: SearchState):
+    """
+    Même évaluation que positionHeuristiqueV2Bitboard, calculée en temps constant à partir des termes tenus à jour par
+    le SearchState pendant la recherche. L'état doit avoir été créé avec positionScore=POSITION_SCORE_V2_CELLS.
+
+    Args:
+        state: état de recherche à évaluer
+
+    Returns:
+        float: évaluation de la position pour le joueur qui doit jouer
+    """
+    # Score pour chaque pièce (pour pénaliser la perte de pièce)
+    scorePiece = 100
+    # Score pour chaque pièce isolé (pour pénaliser les pièces isolé)
+    scoreLonely = 5
+
+    scores = [state.positionSums[colour] - scoreLonely * state.lonelyCounts[colour] - scorePiece * state.lost[colour]
+              for colour in (bitboard.WHITE, bitboard.BLACK)]
+    return scores[state.side] - scores[1 - state.side]
@@ -0,0 +1,71 @@
+"""
+Évaluation vectorisée (NumPy) de plusieurs positions à la fois.
+
+À la frontière d'une recherche à profondeur limitée, tous les fils d'un noeud sont des feuilles : plutôt que
+d'appeler l'heuristique une fois par fils (boucle Python sur les billes), on les évalue ensemble. Chaque position est
+représentée par une ligne d'un tableau d'occupation N x 61 par couleur, et l'heuristique se réduit à quelques produits
+matriciels :
+    - score de position : occupation @ vecteur des scores par case
+    - billes isolées : une bille est isolée si (occupation @ matrice d'adjacence) vaut 0 sur sa case
+    - matériel : nombre de billes perdues
+"""
+from typing import List, Sequence
+
+import numpy as np
+
+import bitboard
+import heuristique
+from bitboard import WHITE, BLACK
+
+# Décalages permettant d'extraire les 61 bits d'un masque en une seule opération
+_BIT_SHIFTS = np.arange(bitboard.NB_CELLS, dtype=np.uint64)
+
+# Matrice d'adjacence des cases : ADJACENCY[i, j] = 1 si les cases i et j sont voisines
+# Les tableaux sont en float32 : les produits matriciels passent alors par BLAS, bien plus rapide que les entiers
+ADJACENCY = np.zeros((bitboard.NB_CELLS, bitboard.NB_CELLS), dtype=np.float32)
+for _cell, _neighbours in enumerate(bitboard.NEIGHBOURS):
+    for _neighbour in _neighbours:
+        if _neighbour != bitboard.OFF_BOARD:
+            ADJACENCY[_cell, _neighbour] = 1
+
+# Score de chaque case pour positionHeuristiqueV2
+POSITION_SCORE_V2_CELLS = np.array(heuristique.POSITION_SCORE_V2_CELLS, dtype=np.float32)
+SCORE_PIECE_V2 = 100
+SCORE_LONELY_V2 = 5
+
+
+def masksToOccupancy(masks: Sequence[int]) -> np.ndarray:
+    """
+    Convertit une liste de N masques en tableau d'occupation N x 61 (0. ou 1.)
+
+    Args:
+        masks: masques (bitboards) d'une couleur
+
+    Returns:
+        np.ndarray: tableau d'occupation
+    """
+    return (np.array(masks, dtype=np.uint64)[:, None] >> _BIT_SHIFTS & np.uint64(1)).astype(np.float32)
+
+
+def _colourScoresV2(occupancy: np.ndarray, lost: np.ndarray) -> np.ndarray:
+    # Nombre de voisins alliés de chaque case, une bille sans voisin allié est isolée
+    nbNeighbours = occupancy @ ADJACENCY
+    nbLonely = (occupancy * (nbNeighbours == 0)).sum(axis=1)
+    return occupancy @ POSITION_SCORE_V2_CELLS - SCORE_LONELY_V2 * nbLonely - SCORE_PIECE_V2 * lost
+
+
+def positionHeuristiqueV2Batch(masks: List[Sequence[int]], lost: List[Sequence[int]], side: int) -> np.ndarray:
+    """
+    positionHeuristiqueV2Bitboard calculée pour N positions à la fois
+
+    Args:
+        masks: [masques des blancs, masques des noirs], chacun de longueur N
+        lost: [billes perdues par les blancs, billes perdues par les noirs], chacun de longueur N
+        side: couleur du point de vue de laquelle les positions sont évaluées
+
+    Returns:
+        np.ndarray: évaluation de chaque position pour le joueur side
+    """
+    white = _colourScoresV2(masksToOccupancy(masks[WHITE]), np.asarray(lost[WHITE]))
+    black = _colourScoresV2(masksToOccupancy(masks[BLACK]), np.asarray(lost[BLACK]))
+    return white - black if side == WHITE else black - white
@@ -0,0 +1,195 @@
+"""
+Encodage compact des coups sous forme d'entiers.
+
+Un coup de la recherche n'est plus une Action seahorse (qui contient deux états complets) mais un petit entier qui
+regroupe tout ce qu'il faut pour le jouer et le classer :
+
+    bits 0-5   : case d'origine (bille qui pousse, index dans bitboard.CELLS)
+    bits 6-8   : direction du coup (index dans bitboard.DIRECTIONS)
+    bits 9-10  : nombre de billes alliées déplacées (1 à 3)
+    bits 11-12 : nombre de billes adverses poussées (0 à 2)
+    bit 13     : une bille sort du plateau (adverse si des billes sont poussées, sinon alliée)
+    bit 14     : la dernière bille de la ligne arrive sur le bord du plateau (bille adverse si des billes sont poussées)
+    bit 15     : déplacement latéral (broadside) : le groupe de nbOwn billes alignées qui part de la case d'origine
+                 dans la direction LINE_DIRECTIONS[ligne] se déplace d'une case dans la direction du coup
+    bits 16-17 : index de la direction de la ligne dans bitboard.LINE_DIRECTIONS (déplacement latéral uniquement)
+
+La classe tactique du coup (poussée, sumito 2v1 / 3v1 / 3v2, éjection, bord) est donc connue dès la génération :
+l'ordonnancement et la détection des positions calmes n'ont pas à construire l'état suivant.
+
+Ces entiers peuvent servir directement de clés pour l'ordonnancement, la table de transposition, etc.
+La conversion en Action n'est faite que pour le coup finalement joué.
+"""
+from game_state_abalone import GameStateAbalone
+from seahorse.game.action import Action
+
+import bitboard
+
+ORIGIN_SHIFT = 0
+DIRECTION_SHIFT = 6
+NB_OWN_SHIFT = 9
+NB_PUSHED_SHIFT = 11
+EJECTS_SHIFT = 13
+EDGE_SHIFT = 14
+BROADSIDE_SHIFT = 15
+LINE_SHIFT = 16
+
+ORIGIN_MASK = 0b111111
+DIRECTION_MASK = 0b111
+COUNT_MASK = 0b11
+LINE_MASK = 0b11
+
+# Aucun coup valide n'a 0 bille alliée, 0 peut donc servir de valeur "pas de coup"
+NO_MOVE = 0
+
+# La case d'origine et la direction suffisent à identifier un coup dans une position donnée (le reste se déduit du
+# plateau) : ces 9 bits servent de clé aux tables d'historique
+MOVE_KEY_MASK = ORIGIN_MASK | DIRECTION_MASK << DIRECTION_SHIFT
+NB_MOVE_KEYS = MOVE_KEY_MASK + 1
+
+
+def encodeMove(origin: int, direction: int, nbOwn: int, nbPushed: int, ejects: bool, edge: bool = False) -> int:
+    """
+    Encode un coup en entier
+
+    Args:
+        origin: case de la bille qui pousse
+        direction: direction du coup
+        nbOwn: nombre de billes alliées déplacées
+        nbPushed: nombre de billes adverses poussées
+        ejects: True si une bille sort du plateau
+        edge: True si la dernière bille de la ligne arrive sur le bord du plateau
+
+    Returns:
+        int: coup encodé
+    """
+    return (origin
+            | direction << DIRECTION_SHIFT
+            | nbOwn << NB_OWN_SHIFT
+            | nbPushed << NB_PUSHED_SHIFT
+            | int(ejects) << EJECTS_SHIFT
+            | int(edge) << EDGE_SHIFT)
+
+
+def encodeBroadside(anchor: int, direction: int, size: int, lineIndex: int) -> int:
+    """
+    Encode un déplacement latéral
+
+    Args:
+        anchor: première case du groupe
+        direction: direction du déplacement
+        size: nombre de billes du groupe (2 ou 3)
+        lineIndex: index de la direction du groupe dans bitboard.LINE_DIRECTIONS
+
+    Returns:
+        int: coup encodé
+    """
+    return (anchor
+            | direction << DIRECTION_SHIFT
+            | size << NB_OWN_SHIFT
+            | 1 << BROADSIDE_SHIFT
+            | lineIndex << LINE_SHIFT)
+
+
+def getMoveKey(move: int) -> int:
+    """
+    Clé compacte (origine, direction) du coup, comprise entre 0 et NB_MOVE_KEYS - 1
+    """
+    return move & MOVE_KEY_MASK
+
+
+def getOrigin(move: int) -> int:
+    return move & ORIGIN_MASK
+
+
+def getDirection(move: int) -> int:
+    return move >> DIRECTION_SHIFT & DIRECTION_MASK
+
+
+def getNbOwn(move: int) -> int:
+    return move >> NB_OWN_SHIFT & COUNT_MASK
+
+
+def getNbPushed(move: int) -> int:
+    return move >> NB_PUSHED_SHIFT & COUNT_MASK
+
+
+def isEjecting(move: int) -> bool:
+    return bool(move >> EJECTS_SHIFT & 1)
+
+
+def isEdge(move: int) -> bool:
+    return bool(move >> EDGE_SHIFT & 1)
+
+
+def isBroadside(move: int) -> bool:
+    return bool(move >> BROADSIDE_SHIFT & 1)
+
+
+def getLineIndex(move: int) -> int:
+    return move >> LINE_SHIFT & LINE_MASK
+
+
+def getBroadsideCells(move: int) -> tuple:
+    """
+    Cases du groupe déplacé par un déplacement latéral
+    """
+    origin = getOrigin(move)
+    return (origin,) + bitboard.RAYS[origin][bitboard.LINE_DIRECTIONS[getLineIndex(move)]][:getNbOwn(move) - 1]
+
+
+def isPush(move: int) -> bool:
+    """
+    Vrai si le coup pousse des billes adverses (sumito)
+    """
+    return getNbPushed(move) > 0
+
+
+def isEdgePush(move: int) -> bool:
+    """
+    Vrai si le coup pousse une bille adverse sur le bord du plateau sans l'éjecter : menace d'éjection au coup suivant
+    """
+    return isPush(move) and isEdge(move)
+
+
+def isCapture(move: int) -> bool:
+    """
+    Vrai si le coup fait sortir une bille adverse du plateau
+    """
+    return isEjecting(move) and getNbPushed(move) > 0
+
+
+def isSuicide(move: int) -> bool:
+    """
+    Vrai si le coup fait sortir une de nos billes du plateau
+    """
+    return isEjecting(move) and getNbPushed(move) == 0
+
+
+def moveToString(move: int) -> str:
+    i, j = bitboard.CELLS[getOrigin(move)]
+    di, dj = bitboard.DIRECTIONS[getDirection(move)]
+    if isBroadside(move):
+        cells = [bitboard.CELLS[cell] for cell in getBroadsideCells(move)]
+        return f"{cells} -> {bitboard.DIRECTION_NAMES[getDirection(move)]} (latéral)"
+    return (f"{(i, j)}->{(i + di, j + dj)} ({getNbOwn(move)}v{getNbPushed(move)}"
+            f"{', sortie' if isEjecting(move) else ''}{', bord' if isEdge(move) else ''})")
+
+
+def moveToAction(state: GameStateAbalone, move: int) -> Action:
+    """
+    Convertit un coup en Action seahorse à partir de l'état de la partie
+
+    Args:
+        state: état de la partie dans lequel le coup est joué
+        move: coup encodé
+
+    Returns:
+        Action: action équivalente (None si le coup n'est pas valide dans cet état ou si c'est un déplacement latéral,
+        que GameStateAbalone ne sait pas représenter)
+    """
+    if isBroadside(move):
+        return None
+    i, j = bitboard.CELLS[getOrigin(move)]
+    di, dj = bitboard.DIRECTIONS[getDirection(move)]
+    return state.convert_light_action_to_action({"from": (i, j), "to": (i + di, j + dj)})
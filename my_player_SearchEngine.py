@@ -0,0 +1,157 @@
+from typing import Optional, Union
+
+from ArrayTranspositionTable import ArrayTranspositionTable
+from LazySmpSearch import LazySmpSearch
+from MoveOrdering import MoveOrdering
+from ParallelSearch import ParallelSearch
+from Ponderer import Ponderer
+from SearchEngine import SearchEngine
+from SearchState import SearchState
+from SharedTranspositionTable import SharedTranspositionTable
+from TimeManager import TimeManager
+from player_abalone import PlayerAbalone
+from seahorse.game.action import Action
+from seahorse.game.game_state import GameState
+
+import heuristique
+import move as mv
+
+# Champs du joueur envoyés par seahorse avec chaque état de la partie (voir PlayerAbalone.to_json)
+SERIALIZED_FIELDS = ('name', 'id', 'piece_type')
+
+# Nombre de processus de recherche supplémentaires, 0 pour chercher dans le seul processus du joueur
+NB_WORKERS = 0
+# Répartition du travail entre les processus : partage des coups de la racine (ParallelSearch) ou table de
+# transposition partagée (LazySmpSearch)
+ROOT_SPLIT = 'rootSplit'
+LAZY_SMP = 'lazySmp'
+PARALLEL_MODE = ROOT_SPLIT
+# Réflexion pendant le tour de l'adversaire (voir Ponderer). Désactivée par défaut : elle n'est utile que si les deux
+# joueurs tournent dans des processus différents (host_game / connect)
+PONDER = False
+
+
+def buildEngine(timeManager: Optional[TimeManager] = None,
+                transpoTable: Optional[Union[ArrayTranspositionTable, SharedTranspositionTable]] = None) -> SearchEngine:
+    """
+    Construit le moteur de recherche du joueur, avec sa propre table de transposition si transpoTable n'est pas donnée.
+    Définie au niveau du module pour que les processus de ParallelSearch et de LazySmpSearch puissent construire le leur
+    (sans gestion du temps : ils s'arrêtent à l'instant donné par le moteur principal).
+    """
+    # L'évaluation est tenue à jour par le SearchState à chaque coup
+    return SearchEngine(heuristiqueFct=heuristique.positionHeuristiqueV2Incremental,
+                        transpoTable=transpoTable if transpoTable is not None else ArrayTranspositionTable(),
+                        moveOrdering=MoveOrdering(),
+                        quiescenceDepth=2,
+                        positionScore=heuristique.POSITION_SCORE_V2_CELLS,
+                        timeManager=timeManager)
+
+
+class MyPlayer(PlayerAbalone):
+    """
+    Player class for Abalone game.
+
+    Attributes:
+        piece_type (str): piece type of the player
+    """
+
+    def __init__(self, piece_type: str, name: str = "bob", time_limit: float = 60 * 15, *args) -> None:
+        """
+        Initialize the PlayerAbalone instance.
+
+        Args:
+            piece_type (str): Type of the player's game piece
+            name (str, optional): Name of the player (default is "bob")
+            time_limit (float, optional): the time limit in (s)
+        """
+        super().__init__(piece_type, name, time_limit, *args)
+        self.timeManager = TimeManager()
+        self.parallelSearch = None
+        if NB_WORKERS and PARALLEL_MODE == LAZY_SMP:
+            # En Lazy SMP, la table du moteur est la table partagée
+            self.engine = buildEngine(self.timeManager, SharedTranspositionTable())
+            self.parallelSearch = LazySmpSearch(self.engine, buildEngine, NB_WORKERS)
+        else:
+            self.engine = buildEngine(self.timeManager)
+            if NB_WORKERS:
+                self.parallelSearch = ParallelSearch(self.engine, buildEngine, NB_WORKERS)
+        self.tableTranspo = self.engine.transpoTable
+        # La réflexion pendant le tour de l'adversaire remplit la même table
+        self.ponderer = Ponderer(buildEngine(transpoTable=self.tableTranspo)) if PONDER else None
+
+    def to_json(self) -> dict:
+        """
+        Seuls les champs du joueur utiles à seahorse (nom, id, type de pièce) sont sérialisés : le moteur de recherche
+        et ses composants ne sont pas sérialisables et n'ont pas à être envoyés avec chaque état
+        """
+        return {key: value for key, value in super().to_json().items() if key in SERIALIZED_FIELDS}
+
+    def compute_action(self, current_state: GameState, **kwargs) -> Action:
+        """
+        Function to implement the logic of the player.
+
+        Args:
+            current_state (GameState): Current game state representation
+            **kwargs: Additional keyword arguments
+
+        Returns:
+            Action: selected feasible action
+        """
+
+        rootState = SearchState.fromGameState(current_state, positionScore=heuristique.POSITION_SCORE_V2_CELLS)
+        # La réflexion pendant le tour de l'adversaire est arrêtée avant d'utiliser la table
+        ponderHit = False
+        if self.ponderer is not None:
+            self.ponderer.stop()
+            ponderHit = self.ponderer.isHit(rootState)
+
+        # Limites de temps du coup selon la phase de jeu, la recherche s'arrête au plus tard à la limite dure
+        self.timeManager.startMove(self.get_remaining_time(), current_state.get_step())
+        maxTime = self.timeManager.getHardLimit()
+
+        # La table est conservée d'un coup à l'autre : on passe à la génération suivante et on supprime les entrées
+        # trop anciennes pour être encore utiles
+        self.tableTranspo.newSearch()
+        self.tableTranspo.sweep()
+        searcher = self.parallelSearch if self.parallelSearch is not None else self.engine
+        evaluation, bestMove, metrics = searcher.search(rootState, maxTime)
+        if self.ponderer is not None:
+            metrics["Ponder hit"] = ponderHit
+            metrics["Ponder depth finished"] = self.ponderer.getDepthFinished()
+        # Seul le coup choisi est converti en Action
+        action = mv.moveToAction(current_state, bestMove) if bestMove is not None else None
+
+        print("-----------------------------------------------------------\n"
+              f"Résultat de la recherche du joueur {current_state.get_next_player().get_name()} - Tour : "
+              f"{current_state.get_step()}")
+        # Affichage des métriques
+        for key in metrics:
+            if key == "Principal variation":
+                print(key, " : ", [mv.moveToString(move) for move in metrics[key]])
+            else:
+                print(key, " : ", metrics[key])
+        print("Meilleur évaluation obtenue :", evaluation)
+
+        print("Scores après l'action :")
+        if action:
+            futureState = action.get_next_game_state()
+            for player in futureState.get_players():
+                print(f"\t{player.get_name()} : {futureState.get_player_score(player)}")
+        else:
+            print("========================================================== Pas d'action proposé =================")
+            # Si il n'y a pas d'action retournée par la recherche (il y a surement un problème), on prend la première
+            # action disponible
+            action = list(current_state.get_possible_actions())[0]
+
+        # Si l'action n'est pas faisable, on prend la première action disponible
+        if not current_state.check_action(action):
+            action = list(current_state.get_possible_actions())[0]
+        elif self.ponderer is not None:
+            # On réfléchit à la position attendue après la réponse prévue de l'adversaire
+            principalVariation = metrics.get("Principal variation", [])
+            if principalVariation and principalVariation[0] == bestMove:
+                ponderState = Ponderer.predictPosition(rootState, principalVariation)
+                if ponderState is not None:
+                    self.ponderer.start(ponderState)
+
+        return action
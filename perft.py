@@ -0,0 +1,144 @@
+"""
+Comptage perft du générateur de coups.
+
+perft(depth) compte les feuilles de l'arbre complet des coups à la profondeur donnée depuis une position de départ de
+main_abalone (classic ou alien). Les comptes de référence sont stockés ci-dessous : toute modification du générateur
+(SearchState) ou du plateau doit les retrouver, et le nombre de noeuds par seconde sert de mesure de vitesse.
+
+Usage :
+    python perft.py -c classic -d 3            # perft + noeuds par seconde
+    python perft.py -c alien -d 2 --divide     # détail par coup de la racine
+    python perft.py -c classic -d 2 --check    # compare avec GameStateAbalone.get_possible_actions
+    python perft.py --verify                   # compare toutes les références stockées
+"""
+import argparse
+import time
+from typing import Dict
+
+from loguru import logger
+
+from SearchState import SearchState
+from game_state_abalone import GameStateAbalone
+from main_abalone import INITIAL_BOARDS, build_initial_state
+from player_abalone import PlayerAbalone
+
+import move as mv
+
+# Nombre de feuilles par profondeur depuis chaque position de départ (règles de GameStateAbalone, un seul coup par
+# position suivante distincte). Les profondeurs 1 à 3 ont été vérifiées avec perftGameState.
+REFERENCE_COUNTS: Dict[str, Dict[int, int]] = {
+    "classic": {1: 48, 2: 2304, 3: 119040, 4: 6149558},
+    "alien": {1: 49, 2: 2431, 3: 120306, 4: 6021948},
+    }
+
+
+def initialState(config: str = "classic") -> GameStateAbalone:
+    """
+    Position de départ d'une configuration de main_abalone, les blancs jouant en premier
+    """
+    return build_initial_state(PlayerAbalone("W", name="W"), PlayerAbalone("B", name="B"), config)
+
+
+def perft(state: SearchState, depth: int) -> int:
+    """
+    Nombre de feuilles de l'arbre des coups à la profondeur donnée. Une position de fin de partie compte comme une
+    feuille.
+
+    Args:
+        state: état de recherche, modifié puis restauré
+        depth: profondeur
+
+    Returns:
+        int: nombre de feuilles
+    """
+    if depth == 0 or state.isDone():
+        return 1
+    moves = state.generateMoves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        token = state.makeMove(move)
+        nodes += perft(state, depth - 1)
+        state.unmakeMove(token)
+    return nodes
+
+
+def divide(state: SearchState, depth: int) -> Dict[int, int]:
+    """
+    perft détaillé par coup de la racine
+
+    Returns:
+        Dict[int, int]: nombre de feuilles sous chaque coup encodé
+    """
+    counts = {}
+    for move in state.generateMoves():
+        token = state.makeMove(move)
+        counts[move] = perft(state, depth - 1)
+        state.unmakeMove(token)
+    return counts
+
+
+def perftGameState(state: GameStateAbalone, depth: int) -> int:
+    """
+    perft avec le générateur officiel (GameStateAbalone.get_possible_actions), beaucoup plus lent : sert uniquement de
+    référence
+    """
+    if depth == 0 or state.is_done():
+        return 1
+    actions = state.get_possible_actions()
+    if depth == 1:
+        return len(actions)
+    return sum(perftGameState(action.get_next_game_state(), depth - 1) for action in actions)
+
+
+def runPerft(config: str, depth: int, showDivide: bool = False) -> int:
+    """
+    Lance perft depuis une position de départ et affiche le nombre de feuilles et de noeuds par seconde
+
+    Returns:
+        int: nombre de feuilles
+    """
+    state = SearchState.fromGameState(initialState(config))
+    start = time.time()
+    if showDivide:
+        counts = divide(state, depth)
+        for move, count in counts.items():
+            print(f"{mv.moveToString(move)} : {count}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(state, depth)
+    elapsed = time.time() - start
+
+    reference = REFERENCE_COUNTS.get(config, {}).get(depth)
+    status = "" if reference is None else (" (ok)" if nodes == reference else f" (ERREUR, attendu {reference})")
+    print(f"perft({config}, {depth}) = {nodes}{status}")
+    print(f"Temps : {elapsed:.2f} s - {nodes / max(elapsed, 1e-9):.0f} noeuds/s")
+    return nodes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="perft.py", description="Comptage perft du générateur de coups")
+    parser.add_argument("-c", "--config", choices=list(INITIAL_BOARDS), default="classic",
+                        help="Position de départ")
+    parser.add_argument("-d", "--depth", type=int, default=3, help="Profondeur")
+    parser.add_argument("--divide", action="store_true", help="Affiche le détail par coup de la racine")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare avec le générateur de GameStateAbalone (lent)")
+    parser.add_argument("--verify", action="store_true", help="Vérifie toutes les références stockées")
+    args = parser.parse_args()
+
+    # Les TimeManager de seahorse écrivent un message à chaque création d'état
+    logger.remove()
+
+    if args.verify:
+        ok = True
+        for config, counts in REFERENCE_COUNTS.items():
+            for depth in counts:
+                ok &= runPerft(config, depth) == counts[depth]
+        print("Toutes les références sont retrouvées" if ok else "Des références ne sont pas retrouvées")
+    else:
+        nodes = runPerft(args.config, args.depth, args.divide)
+        if args.check:
+            expected = perftGameState(initialState(args.config), args.depth)
+            print(f"GameStateAbalone : {expected} ({'ok' if nodes == expected else 'ERREUR'})")
@@ -0,0 +1,28 @@
+from loguru import logger
+
+import random_player_abalone
+from LazySmpSearch import _perturbHelper
+from MoveOrdering import MoveOrdering
+from SearchEngine import SearchEngine
+from main_abalone import build_initial_state
+
+logger.remove()
+
+
+def helperHistory(helperId: int):
+    state = build_initial_state(random_player_abalone.MyPlayer("W", name="white"),
+                                random_player_abalone.MyPlayer("B", name="black"))
+    engine = SearchEngine(moveOrdering=MoveOrdering())
+    searchState = engine.startSearch(state, 1)
+    _perturbHelper(engine, searchState, helperId)
+    return engine.moveOrdering.history
+
+
+def test_helpers_are_perturbed_after_start_search():
+    # Amplitude par défaut de MoveOrdering.randomizeHistory
+    amplitude = 64
+    history0 = helperHistory(0)
+    history1 = helperHistory(1)
+    assert history0 != history1
+    # Le bruit n'est pas divisé par 2 par MoveOrdering.newSearch : il garde toute son amplitude
+    assert max(max(table) for table in history0) > amplitude // 2
@@ -0,0 +1,71 @@
+import math
+import time
+
+from loguru import logger
+
+import ParallelSearch
+import heuristique
+import random_player_abalone
+from ArrayTranspositionTable import ArrayTranspositionTable
+from MoveOrdering import MoveOrdering
+from SearchEngine import SearchEngine
+from SearchState import SearchState
+from main_abalone import build_initial_state
+
+logger.remove()
+
+DEPTH = 3
+
+
+def buildWorkerEngine() -> SearchEngine:
+    return SearchEngine(heuristiqueFct=heuristique.positionHeuristiqueV2Incremental,
+                        transpoTable=ArrayTranspositionTable(16),
+                        moveOrdering=MoveOrdering(),
+                        positionScore=heuristique.POSITION_SCORE_V2_CELLS)
+
+
+def rootState() -> SearchState:
+    state = build_initial_state(random_player_abalone.MyPlayer("W", name="white"),
+                                random_player_abalone.MyPlayer("B", name="black"))
+    return SearchState.fromGameState(state, positionScore=heuristique.POSITION_SCORE_V2_CELLS)
+
+
+def initWorker(monkeypatch) -> None:
+    # Les tâches sont exécutées dans ce processus, comme le ferait un processus du pool
+    monkeypatch.setattr(ParallelSearch, "_workerRoot", None)
+    ParallelSearch._initWorker(buildWorkerEngine)
+
+
+def test_worker_returns_principal_variation(monkeypatch):
+    initWorker(monkeypatch)
+    state = rootState()
+    moves = state.generateMoves()[:4]
+    results, _, stopped = ParallelSearch._searchRootMoves(state.encode(), moves, DEPTH, -math.inf,
+                                                          time.time() + 600)
+    assert not stopped and [move for move, _, _ in results] == moves
+    for move, _, pv in results:
+        # La réponse de l'adversaire est disponible pour Ponderer
+        assert len(pv) == DEPTH - 1
+        tokens = [state.makeMove(move)]
+        for reply in pv:
+            assert state.isLegal(reply)
+            tokens.append(state.makeMove(reply))
+        for token in reversed(tokens):
+            state.unmakeMove(token)
+
+
+def test_worker_keeps_move_ordering_between_tasks_of_a_search(monkeypatch):
+    initWorker(monkeypatch)
+    state = rootState()
+    moves = state.generateMoves()
+    deadline = time.time() + 600
+    ParallelSearch._searchRootMoves(state.encode(), moves[:1], DEPTH, -math.inf, deadline)
+    moveOrdering = ParallelSearch._workerEngine.moveOrdering
+    history = [list(table) for table in moveOrdering.history]
+    assert any(moveOrdering.killers)
+
+    # Tâche suivante de la même recherche, sans coupure sous le coup (profondeur 1) : les killers et l'historique ne
+    # sont ni oubliés ni divisés par 2
+    killers = [list(levelKillers) for levelKillers in moveOrdering.killers]
+    ParallelSearch._searchRootMoves(state.encode(), moves[1:2], 1, -math.inf, deadline)
+    assert moveOrdering.killers == killers and moveOrdering.history == history
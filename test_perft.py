@@ -0,0 +1,48 @@
+import random
+
+import pytest
+from loguru import logger
+
+import heuristique
+from SearchState import SearchState
+from perft import REFERENCE_COUNTS, initialState, perft
+
+logger.remove()
+
+
+def snapshot(state: SearchState) -> tuple:
+    return (tuple(state.masks), state.side, tuple(state.lost), state.step, state.hash, tuple(state.positionSums),
+            tuple(state.lonelyCounts))
+
+
+def playedPositions(config: str, allowBroadside: bool, seed: int = 0):
+    """
+    Positions d'une partie aléatoire, jusqu'à la limite de tours : les clés de tours restants sont donc aussi couvertes
+    """
+    rng = random.Random(seed)
+    state = SearchState.fromGameState(initialState(config), allowBroadside,
+                                      positionScore=heuristique.POSITION_SCORE_V2_CELLS)
+    while not state.isDone():
+        yield state
+        state.makeMove(rng.choice(state.generateMoves()))
+
+
+@pytest.mark.parametrize("config", list(REFERENCE_COUNTS))
+@pytest.mark.parametrize("depth", [1, 2])
+def test_reference_counts(config, depth):
+    assert perft(SearchState.fromGameState(initialState(config)), depth) == REFERENCE_COUNTS[config][depth]
+
+
+@pytest.mark.parametrize("config", list(REFERENCE_COUNTS))
+@pytest.mark.parametrize("allowBroadside", [False, True])
+def test_make_unmake_restores_state(config, allowBroadside):
+    for state in playedPositions(config, allowBroadside):
+        before = snapshot(state)
+        for move in state.generateMoves():
+            token = state.makeMove(move)
+            # Les valeurs tenues à jour par makeMove sont celles d'un état construit directement
+            fresh = state.copy()
+            assert (state.hash, state.positionSums, state.lonelyCounts) \
+                == (fresh.hash, fresh.positionSums, fresh.lonelyCounts)
+            state.unmakeMove(token)
+            assert snapshot(state) == before
@@ -0,0 +1,42 @@
+import json
+
+from loguru import logger
+
+import my_player_SearchEngine
+import random_player_abalone
+from main_abalone import build_initial_state
+
+logger.remove()
+
+
+def dumpState(player) -> str:
+    # Même sérialisation que seahorse.game.master.GameMaster.play_game
+    state = build_initial_state(player, random_player_abalone.MyPlayer("B", name="random"))
+    return json.dumps(state.to_json(), default=lambda x: x.to_json())
+
+
+def test_search_engine_player_serializes():
+    player = my_player_SearchEngine.MyPlayer("W", name="engine")
+    # Le joueur contient aussi un moteur, une table et un TimeManager, qui ne doivent pas être sérialisés
+    assert player.timeManager is not None
+    data = json.loads(dumpState(player))
+    assert {"name": "engine", "id": player.get_id(), "piece_type": "W"} in data["players"]
+
+
+def test_parallel_search_player_serializes(monkeypatch):
+    monkeypatch.setattr(my_player_SearchEngine, "NB_WORKERS", 1)
+    for mode in (my_player_SearchEngine.ROOT_SPLIT, my_player_SearchEngine.LAZY_SMP):
+        monkeypatch.setattr(my_player_SearchEngine, "PARALLEL_MODE", mode)
+        player = my_player_SearchEngine.MyPlayer("W", name="engine")
+        try:
+            assert player.parallelSearch is not None
+            dumpState(player)
+        finally:
+            player.parallelSearch.close()
+
+
+def test_pondering_player_serializes(monkeypatch):
+    monkeypatch.setattr(my_player_SearchEngine, "PONDER", True)
+    player = my_player_SearchEngine.MyPlayer("W", name="engine")
+    assert player.ponderer is not None
+    dumpState(player)
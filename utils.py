@@ -7,6 +7,9 @@ from game_state_abalone import GameStateAbalone
 from seahorse.utils.custom_exceptions import MethodNotImplementedError
 from master_abalone import MasterAbalone
 
+import bitboard
+import move as mv
+
 import math
 import random
 
@@ -54,13 +57,12 @@ def getWinner(state: GameState):
     if len(itera) > 1:  # égalité
         final_rep = state.get_rep()
         env = final_rep.get_env()
-        dim = final_rep.get_dimensions()
         dist = dict.fromkeys(players_id, 0)
-        center = (dim[0] // 2, dim[1] // 2)
-        for i, j in list(env.keys()):
-            p = env.get((i, j), None)
+        # Distance au centre précalculée pour chaque case
+        centreDistance = bitboard.CENTRE_DISTANCE_BY_COORD
+        for coord, p in env.items():
             if p.get_owner_id():
-                dist[p.get_owner_id()] += manhattanDist(center, (i, j))
+                dist[p.get_owner_id()] += centreDistance[coord]
         min_dist = min(dist.values())
         players_id = list(filter(lambda key: dist[key] == min_dist, dist))
         itera = list(filter(lambda x: x.get_id() in players_id, state.get_players()))
@@ -103,6 +105,26 @@ def getOrderScore(action: Action) -> float:
     return score
 
 
+def getMoveOrderScore(move: int) -> float:
+    """
+    Équivalent de getOrderScore pour un coup encodé (voir move.py) : l'information est lue directement dans le coup,
+    sans avoir à construire ni comparer les états.
+
+    Args:
+        move: coup à étudier
+
+    Returns:
+        float: score du coup
+    """
+    # On veut étudier en priorité les coups qui éliminent une pièce de l'adversaire
+    if mv.isCapture(move):
+        return 1
+    # On veut étudier en dernier les coups qui éliminent nos propres pièces
+    if mv.isSuicide(move):
+        return -1
+    return 0
+
+
 def getPlayerDiffScore(action: Action) -> float:
     # Définition de l'état actuel et de l'état engendré par l'action
     currentState = action.get_current_game_state()
@@ -188,6 +210,10 @@ def isLonely(state: GameStateAbalone, coord, color):
     Returns:
         bool: True si la bille est isolé, False sinon
     """
-    voisinage = state.get_neighbours(coord[0], coord[1])
-
-    return all(voisinage[voisin][0] != color for voisin in voisinage)
+    env = state.get_rep().get_env()
+    for voisin in bitboard.NEIGHBOURS[bitboard.CELL_INDEX[coord]]:
+        if voisin != bitboard.OFF_BOARD:
+            piece = env.get(bitboard.CELLS[voisin])
+            if piece is not None and piece.get_type() == color:
+                return False
+    return True